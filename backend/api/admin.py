@@ -1,7 +1,7 @@
 from django.contrib import admin
 from .models import (
-    Movie, Theater, Seat, Show, ShowSeat,
-    Ticket, TicketSeat, Payment, Review
+    Movie, Theater, Seat, Show, ShowSeat, SeatHold,
+    Ticket, TicketSeat, Payment, Review, Job
 )
 
 
@@ -38,6 +38,13 @@ class ShowAdmin(admin.ModelAdmin):
     inlines = [ShowSeatInline]
 
 
+@admin.register(SeatHold)
+class SeatHoldAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "show", "expires_at")
+    search_fields = ("id", "user__username")
+    readonly_fields = ("id", "created_at")
+
+
 class TicketSeatInline(admin.TabularInline):
     model = TicketSeat
     extra = 0
@@ -47,6 +54,7 @@ class TicketSeatInline(admin.TabularInline):
 @admin.register(Ticket)
 class TicketAdmin(admin.ModelAdmin):
     list_display = ("id", "user", "show", "total_price", "status", "booking_time")
+    list_select_related = ("user", "show__movie", "show__theater")  # Show.__str__ reads both
     list_filter = ("status",)
     search_fields = ("id", "user__username", "show__movie__title")
     readonly_fields = ("id", "booking_time", "created_at", "updated_at", "ticket_qr")
@@ -66,3 +74,10 @@ class ReviewAdmin(admin.ModelAdmin):
     list_display = ("movie", "user", "rating", "created_at")
     list_filter = ("rating",)
     search_fields = ("movie__title", "user__username")
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("name", "status", "attempts", "run_after", "locked_by", "created_at")
+    list_filter = ("status", "name")
+    readonly_fields = ("created_at", "updated_at", "last_error")
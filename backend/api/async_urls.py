@@ -0,0 +1,12 @@
+from django.urls import path
+
+from . import async_views
+
+
+# Served in front of api/urls.py under ASGI (see backend/asgi.py), same paths and names
+urlpatterns = [
+    path("movies/", async_views.movie_list, name="movies-list"),
+    path("shows/", async_views.show_list, name="shows-list"),
+    path("shows/<uuid:pk>/seatmap/", async_views.show_seatmap, name="shows-seatmap"),
+    path("schedule/", async_views.schedule, name="schedule"),
+]
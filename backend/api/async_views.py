@@ -0,0 +1,118 @@
+from functools import wraps
+from types import SimpleNamespace
+
+from asgiref.sync import sync_to_async
+from django.http import Http404, HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException, AuthenticationFailed, NotAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import exception_handler
+
+from .cache import acached_response
+from .fast_serializers import fast_data
+from .models import Show
+from .renderers import FastJSONRenderer
+from .schedule import abuild_schedule, schedule_range
+from .seatmap import abuild_seat_map, seat_map_etag, seat_map_shows
+from .serializers import ShowSummarySerializer
+from .views import MovieViewSet, ScheduleView, ShowViewSet
+
+
+def _render(response):
+    """The JSON response the sync view would send for a DRF Response made here."""
+    rendered = HttpResponse(
+        FastJSONRenderer().render(response.data),
+        status=response.status_code,
+        content_type="application/json",
+    )
+    for header, value in response.headers.items():
+        if header != "Content-Type":
+            rendered[header] = value
+    rendered["Vary"] = "Accept"
+    return rendered
+
+
+def async_read(sync_view):
+    """
+    Serve GET requests for JSON with the decorated async view, anything else (writes,
+    the browsable API) goes to the DRF view that serves the same URL under WSGI.
+    Credentials sent with the request are checked by the DRF view's authentication,
+    so an invalid or expired token is a 401 on both.
+    """
+    authentication_classes = sync_view.cls.authentication_classes
+    sync_view = sync_to_async(sync_view)
+
+    def decorator(view):
+        @csrf_exempt
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method != "GET" or "format" in request.GET or "text/html" in request.headers.get("Accept", ""):
+                return await sync_view(request, *args, **kwargs)
+            drf_request = Request(request, authenticators=[auth() for auth in authentication_classes])
+            try:
+                if "Authorization" in request.headers:
+                    # in a thread, tokens without the user claims load the User
+                    await sync_to_async(lambda: drf_request.user)()
+                response = await view(drf_request, *args, **kwargs)
+            except (APIException, Http404) as exc:
+                if isinstance(exc, (AuthenticationFailed, NotAuthenticated)):
+                    # as APIView.handle_exception, for the WWW-Authenticate header
+                    exc.auth_header = drf_request.authenticators[0].authenticate_header(drf_request)
+                response = exception_handler(exc, {})
+            return _render(response)
+        return wrapper
+    return decorator
+
+
+async def _list_response(serializer_class, queryset, request, view):
+    """FastReadMixin.list on the async ORM."""
+    paginator = view.pagination_class()
+    page = await paginator.apaginate_queryset(queryset, request, view=view)
+    if page is None:
+        rows = [row async for row in queryset]
+        return Response(fast_data(serializer_class, rows, request.query_params, many=True))
+    return paginator.get_paginated_response(fast_data(serializer_class, page, request.query_params, many=True))
+
+
+@async_read(MovieViewSet.as_view({"get": "list", "post": "create"}))
+async def movie_list(request):
+    async def build():
+        params = request.query_params
+        view = SimpleNamespace(
+            pagination_class=MovieViewSet.pagination_class,
+            cursor_ordering=MovieViewSet.catalog_ordering(params),
+        )
+        return await _list_response(MovieViewSet.serializer_class, MovieViewSet.catalog_queryset(params), request, view)
+
+    return await acached_response(request, "movies", build)
+
+
+@async_read(ShowViewSet.as_view({"get": "list", "post": "create"}))
+async def show_list(request):
+    queryset = ShowViewSet.with_seat_counts(Show.objects.select_related("movie", "theater"))
+    queryset = ShowViewSet.filter_shows(queryset, request.query_params)
+    return await _list_response(ShowSummarySerializer, queryset, request, ShowViewSet)
+
+
+@async_read(ShowViewSet.as_view({"get": "seatmap"}))
+async def show_seatmap(request, pk):
+    show = await seat_map_shows().filter(pk=pk).afirst()
+    if show is None:
+        raise Http404("No Show matches the given query.")
+
+    etag = seat_map_etag(show)
+    if etag in request.headers.get("If-None-Match", ""):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(await abuild_seat_map(show), headers={"ETag": etag})
+
+
+@async_read(ScheduleView.as_view())
+async def schedule(request):
+    first_day, last_day = schedule_range(request.query_params)
+    return Response(await abuild_schedule(
+        first_day, last_day,
+        movie_id=request.query_params.get("movie"),
+        theater_id=request.query_params.get("theater"),
+    ))
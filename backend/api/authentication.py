@@ -0,0 +1,115 @@
+from django.contrib.auth.models import User
+from django.utils.functional import SimpleLazyObject
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+
+# Claims added to the tokens, enough for the permission checks and for filtering by user
+USERNAME_CLAIM = "username"
+IS_STAFF_CLAIM = "is_staff"
+
+
+def add_user_claims(token, user):
+    token[USERNAME_CLAIM] = user.username
+    token[IS_STAFF_CLAIM] = user.is_staff
+    return token
+
+
+class ClaimsUser(SimpleLazyObject):
+    """
+    request.user for a token with the user claims. id, username and is_staff come from the
+    token, anything else (email, check_password, save...) loads the User row the first time
+    it is used.
+    """
+
+    is_active = True
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, token):
+        user_id = token[api_settings.USER_ID_CLAIM]
+        super().__init__(lambda: self.load(user_id))
+        # not through setattr, which LazyObject passes on to the loaded user
+        self.__dict__["token"] = token
+
+    @staticmethod
+    def load(user_id):
+        user = User.objects.filter(pk=user_id).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        return user
+
+    @property
+    def id(self):
+        # simplejwt may store the id as a string
+        return User._meta.pk.to_python(self.token[api_settings.USER_ID_CLAIM])
+
+    pk = id
+
+    @property
+    def username(self):
+        return self.token[USERNAME_CLAIM]
+
+    @property
+    def is_staff(self):
+        return self.token[IS_STAFF_CLAIM]
+
+    def __bool__(self):
+        return True
+
+
+class JWTClaimsAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication without the User query on every request: tokens carrying the user
+    claims get a ClaimsUser. Tokens issued before the claims were added still load the user.
+
+    The claims are what they were when the token was issued or refreshed, so a change to
+    is_staff or a deactivated account takes effect within ACCESS_TOKEN_LIFETIME.
+    """
+
+    def get_user(self, validated_token):
+        if IS_STAFF_CLAIM in validated_token and USERNAME_CLAIM in validated_token:
+            return ClaimsUser(validated_token)
+        return super().get_user(validated_token)
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        return add_user_claims(super().get_token(user), user)
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refreshed tokens get the user's current username and is_staff. TokenRefreshSerializer.validate
+    with the user loaded once, for the authentication rule and the claims.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        user = User.objects.only("username", "is_staff", "is_active").filter(
+            **{api_settings.USER_ID_FIELD: user_id}
+        ).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages["no_active_account"], "no_active_account")
+
+        # the access token copies its claims from the refresh token
+        add_user_claims(refresh, user)
+        data = {"access": str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                try:
+                    refresh.blacklist()
+                except AttributeError:
+                    pass  # the blacklist app isn't installed
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data["refresh"] = str(refresh)
+
+        return data
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import math
+import time
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+
+# Cached responses are kept this long at most. Versions are invalidated right away in a
+# shared cache (Redis), a local-memory cache is per process so other workers catch up
+# when their entries expire.
+RESPONSE_CACHE_SECONDS = 300
+
+
+def _version_key(namespace):
+    return f"version:{namespace}"
+
+
+def _modified_key(namespace):
+    return f"modified:{namespace}"
+
+
+def get_version(namespace):
+    version = cache.get(_version_key(namespace))
+    if version is None:
+        cache.add(_version_key(namespace), 1, None)
+        version = cache.get(_version_key(namespace), 1)
+    return version
+
+
+async def aget_version(namespace):
+    version = await cache.aget(_version_key(namespace))
+    if version is None:
+        await cache.aadd(_version_key(namespace), 1, None)
+        version = await cache.aget(_version_key(namespace), 1)
+    return version
+
+
+def bump_version(namespace):
+    """
+    Invalidate every cached response of a namespace by moving to a new version.
+    Done after commit, so a reader can't cache the old rows under the new version.
+    """
+    def bump():
+        # the time first, so a reader that sees the new version also sees its time
+        cache.set(_modified_key(namespace), _next_modified(cache.get(_modified_key(namespace))), None)
+        try:
+            cache.incr(_version_key(namespace))
+        except ValueError:
+            cache.add(_version_key(namespace), 1, None)
+
+    transaction.on_commit(bump)
+
+
+def _next_modified(previous):
+    # whole seconds like HTTP dates, and later than the previous version's even within a second
+    return max(math.ceil(time.time()), (previous or 0) + 1)
+
+
+def get_modified(namespace):
+    """
+    When the namespace was last changed (its version bumped), the Last-Modified of its
+    responses. Row timestamps can't tell: deletes and update() calls leave them as they were.
+    """
+    modified = cache.get(_modified_key(namespace))
+    if modified is None:
+        # not known (a new or cleared cache), take it to be now
+        cache.add(_modified_key(namespace), _next_modified(None), None)
+        modified = cache.get(_modified_key(namespace))
+    return modified
+
+
+async def aget_modified(namespace):
+    modified = await cache.aget(_modified_key(namespace))
+    if modified is None:
+        await cache.aadd(_modified_key(namespace), _next_modified(None), None)
+        modified = await cache.aget(_modified_key(namespace))
+    return modified
+
+
+def _response_key(request, namespace, version):
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    return f"response:{namespace}:{version}:{request.path}?{query}"
+
+
+def _cache_entry(response, last_modified):
+    body = json.dumps(response.data, cls=JSONEncoder, sort_keys=True)
+    return {
+        "data": response.data,
+        "etag": f'"{hashlib.md5(body.encode()).hexdigest()}"',
+        "last_modified": last_modified,
+        "link": response.get("Link"),
+    }
+
+
+def _serve_entry(request, entry):
+    headers = {"ETag": entry["etag"], "Cache-Control": "no-cache"}
+    if entry["last_modified"]:
+        headers["Last-Modified"] = http_date(entry["last_modified"])
+    if entry["link"]:
+        headers["Link"] = entry["link"]
+
+    if_none_match = request.headers.get("If-None-Match")
+    if_modified_since = parse_http_date_safe(request.headers.get("If-Modified-Since", ""))
+    if if_none_match:
+        not_modified = entry["etag"] in if_none_match
+    else:
+        not_modified = bool(entry["last_modified"] and if_modified_since and if_modified_since >= int(entry["last_modified"]))
+
+    if not_modified:
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(entry["data"], headers=headers)
+
+
+def cached_response(request, namespace, build):
+    """
+    Serve a GET response from the cache, keyed on the path and query params.
+    `build` makes the response on a miss. Responses carry an ETag and Last-Modified
+    so clients can revalidate with If-None-Match / If-Modified-Since and get a 304.
+    """
+    key = _response_key(request, namespace, get_version(namespace))
+    entry = cache.get(key)
+    if entry is None:
+        last_modified = get_modified(namespace)
+        response = build()
+        if response.status_code != status.HTTP_200_OK:
+            return response
+        entry = _cache_entry(response, last_modified)
+        cache.set(key, entry, RESPONSE_CACHE_SECONDS)
+    return _serve_entry(request, entry)
+
+
+async def acached_response(request, namespace, build):
+    """cached_response for async views, `build` is a coroutine function. Shares the sync views' entries."""
+    key = _response_key(request, namespace, await aget_version(namespace))
+    entry = await cache.aget(key)
+    if entry is None:
+        last_modified = await aget_modified(namespace)
+        response = await build()
+        if response.status_code != status.HTTP_200_OK:
+            return response
+        entry = _cache_entry(response, last_modified)
+        await cache.aset(key, entry, RESPONSE_CACHE_SECONDS)
+    return _serve_entry(request, entry)
@@ -0,0 +1,150 @@
+from operator import attrgetter
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.response import Response
+
+from .metrics import serialization_timer
+
+
+def _identity(value):
+    return value
+
+
+# to_representation methods that come down to one builtin for a value that isn't None
+CONVERSIONS = {
+    serializers.CharField.to_representation: str,
+    serializers.IntegerField.to_representation: int,
+    serializers.FloatField.to_representation: float,
+    serializers.ReadOnlyField.to_representation: _identity,
+}
+
+
+class CompiledSerializer:
+    """
+    Read-only version of a ModelSerializer, for list endpoints that send many rows.
+
+    The serializer's fields are looked at once, and each gets a getter and a
+    converter: plain attribute lookups instead of Field.get_attribute, the
+    `<fk>_id` column for primary key relations, str/int/float for simple fields
+    and a compiled child for nested serializers. Fields with anything special keep
+    using their own to_representation, so the output is the same as the serializer's.
+    """
+
+    def __init__(self, serializer):
+        model = serializer.Meta.model
+        self.fields = []
+        for field in serializer.fields.values():
+            if not field.write_only:
+                self.fields.append(self.compile_field(model, field))
+
+    def compile_field(self, model, field):
+        if isinstance(field, serializers.ListSerializer):
+            child = CompiledSerializer(field.child)
+            return field.field_name, field, self.getter(model, field), child.many
+        if isinstance(field, serializers.Serializer):
+            return field.field_name, field, self.getter(model, field), CompiledSerializer(field).one
+
+        pk_only = isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None
+        if pk_only and len(field.source_attrs) == 1:
+            # the pk is the foreign key column, the related row isn't needed
+            attname = model._meta.get_field(field.source_attrs[0]).attname
+            return field.field_name, field, attrgetter(attname), _identity
+
+        to_representation = type(field).to_representation
+        if to_representation in CONVERSIONS:
+            convert = CONVERSIONS[to_representation]
+        elif isinstance(field, serializers.UUIDField) and field.uuid_format == "hex_verbose":
+            convert = str
+        elif isinstance(field, serializers.JSONField) and not field.binary:
+            convert = _identity
+        else:
+            convert = field.to_representation
+        return field.field_name, field, self.getter(model, field), convert
+
+    @staticmethod
+    def getter(model, field):
+        """attrgetter for the field's source, or Field.get_attribute when the source isn't a plain value."""
+        if field.source == "*":
+            return field.get_attribute
+
+        for position, name in enumerate(field.source_attrs):
+            if model is None:
+                return field.get_attribute
+            try:
+                model_field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                # an annotation on the queryset is a plain value too, a method or property may not be
+                last = position == len(field.source_attrs) - 1
+                if last and not hasattr(model, name):
+                    break
+                return field.get_attribute
+            model = model_field.related_model
+        return attrgetter(".".join(field.source_attrs))
+
+    def one(self, instance):
+        ret = {}
+        for name, field, get, convert in self.fields:
+            try:
+                try:
+                    value = get(instance)
+                except AttributeError:
+                    # a null relation on the way to the value, the field decides what that means
+                    value = field.get_attribute(instance)
+            except SkipField:
+                continue
+            ret[name] = None if value is None else convert(value)
+        return ret
+
+    def many(self, instances):
+        if isinstance(instances, models.manager.BaseManager):
+            instances = instances.all()
+        return [self.one(instance) for instance in instances]
+
+    def only(self, names):
+        """A copy that keeps the given fields, for ?fields= (see SparseFieldsMixin)."""
+        compiled = CompiledSerializer.__new__(CompiledSerializer)
+        compiled.fields = [entry for entry in self.fields if entry[0] in names]
+        return compiled
+
+
+_compiled = {}
+
+
+def compile_serializer(serializer_class):
+    if serializer_class not in _compiled:
+        _compiled[serializer_class] = CompiledSerializer(serializer_class())
+    return _compiled[serializer_class]
+
+
+def fast_data(serializer_class, instance, params, many=False):
+    """Data of the serializer class through its compiled version, honouring ?fields= like SparseFieldsMixin."""
+    compiled = compile_serializer(serializer_class)
+    requested = params.get("fields")
+    if requested:
+        compiled = compiled.only({name.strip() for name in requested.split(",")})
+
+    with serialization_timer():
+        return compiled.many(instance) if many else compiled.one(instance)
+
+
+class FastReadMixin:
+    """
+    Serve list and retrieve through the compiled serializer of the view's serializer
+    class, writes still use the serializer itself.
+    """
+
+    def fast_data(self, instance, many=False):
+        return fast_data(self.get_serializer_class(), instance, self.request.query_params, many=many)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.fast_data(page, many=True))
+        return Response(self.fast_data(queryset, many=True))
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response(self.fast_data(self.get_object()))
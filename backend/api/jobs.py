@@ -0,0 +1,122 @@
+import random
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import cache
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+
+
+# a running job whose worker hasn't finished it after this long is taken to have died
+JOB_TIMEOUT_SECONDS = 600
+# retry delays double from the base on every failed attempt, up to the max
+RETRY_BASE_SECONDS = 10
+RETRY_MAX_SECONDS = 3600
+
+# registered tasks by name, see the task decorator
+TASKS = {}
+
+
+def task(func):
+    """Register a function as a task that can be queued with enqueue()."""
+    TASKS[func.__name__] = func
+    return func
+
+
+def enqueue(func, run_after=None, max_attempts=5, **payload):
+    """
+    Queue a task to run in the background with the given (JSON serializable) arguments.
+    The job is a row in the caller's transaction, so it only runs if that commits.
+    Without a run_jobs worker (settings.JOBS_WORKER off) a job that is due is handed to
+    this process's job thread after the commit, the request doesn't wait for it.
+    """
+    if TASKS.get(func.__name__) is not func:
+        raise ValueError(f"{func.__name__} is not a registered task")
+    job = Job.objects.create(
+        name=func.__name__,
+        payload=payload,
+        run_after=run_after or timezone.now(),
+        max_attempts=max_attempts,
+    )
+    if not settings.JOBS_WORKER and run_after is None:
+        transaction.on_commit(lambda: get_inline_executor().submit(run_inline, job))
+    return job
+
+
+@cache
+def get_inline_executor():
+    """The thread that runs this process's jobs when there is no run_jobs worker."""
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="jobs")
+
+
+def run_inline(job):
+    """Claim and run a job on the job thread, with a fresh connection like a request gets."""
+    close_old_connections()
+    try:
+        if claim_job(job, "inline", timezone.now()):
+            run_job(job)
+    finally:
+        close_old_connections()
+
+
+def retry_delay(attempts):
+    """Seconds before the next try after `attempts` failures: exponential with jitter."""
+    delay = min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def claim_jobs(worker, limit=10):
+    """
+    Take up to `limit` due jobs for a worker. Each job is claimed with a conditional
+    UPDATE on the state it was read in, so two workers never run the same job.
+    Jobs left running by a dead worker are claimed again after JOB_TIMEOUT_SECONDS.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=JOB_TIMEOUT_SECONDS)
+
+    # stale jobs that are out of attempts won't be retried
+    Job.objects.filter(status="running", locked_at__lte=stale, attempts__gte=F("max_attempts")).update(
+        status="failed", last_error="Timed out", locked_at=None
+    )
+
+    due = Q(status="queued", run_after__lte=now) | Q(status="running", locked_at__lte=stale)
+    return [job for job in Job.objects.filter(due).order_by("run_after")[:limit] if claim_job(job, worker, now)]
+
+
+def claim_job(job, worker, now):
+    """Take one job with a conditional UPDATE on the state it was read in. False if someone else took it."""
+    taken = Job.objects.filter(pk=job.pk, status=job.status, attempts=job.attempts).update(
+        status="running", locked_by=worker, locked_at=now, attempts=F("attempts") + 1
+    )
+    if taken:
+        job.status, job.locked_by, job.locked_at = "running", worker, now
+        job.attempts += 1
+    return bool(taken)
+
+
+def run_job(job):
+    """Run a claimed job in its own transaction. A failure is retried later until max_attempts."""
+    try:
+        with transaction.atomic():
+            TASKS[job.name](**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            Job.objects.filter(pk=job.pk).update(status="failed", last_error=error, locked_at=None)
+        else:
+            Job.objects.filter(pk=job.pk).update(
+                status="queued",
+                run_after=timezone.now() + timedelta(seconds=retry_delay(job.attempts)),
+                last_error=error,
+                locked_by="",
+                locked_at=None,
+            )
+        return False
+
+    Job.objects.filter(pk=job.pk).update(status="done", locked_at=None)
+    return True
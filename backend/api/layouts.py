@@ -0,0 +1,132 @@
+import csv
+import io
+import re
+
+from rest_framework.exceptions import ValidationError
+
+
+# A seat selector picks seats by row and seat number:
+# "H" (row H), "H-J" (rows H to J), "K5-20" (row K, seats 5 to 20), "C12" (one seat),
+# "H-J5-20" (rows H to J, seats 5 to 20)
+SELECTOR_RE = re.compile(r"^([A-Z]+)(?:-([A-Z]+))?(?:(\d+)(?:-(\d+))?)?$")
+
+# upper bound on the seats one layout can create
+MAX_LAYOUT_SEATS = 10000
+
+
+def _letter_range(start, end):
+    if len(start) != 1 or len(end) != 1 or start > end:
+        raise ValidationError(f"Invalid row range {start}-{end}")
+    return [chr(c) for c in range(ord(start), ord(end) + 1)]
+
+
+def _parse_rows(rows):
+    """Rows are a list or a comma separated string of rows and row ranges, e.g. "A-H,J-P"."""
+    if isinstance(rows, str):
+        rows = [part.strip() for part in rows.split(",") if part.strip()]
+
+    labels = []
+    for part in rows:
+        part = str(part).upper()
+        if "-" in part:
+            labels.extend(_letter_range(*part.split("-", 1)))
+        elif part.isalpha():
+            labels.append(part)
+        else:
+            raise ValidationError(f"Invalid row {part}")
+    return labels
+
+
+def _parse_columns(columns):
+    """Columns are a seat count (24) or a range ("1-24")."""
+    if isinstance(columns, int):
+        return range(1, columns + 1)
+
+    match = re.match(r"^(\d+)-(\d+)$", str(columns).strip())
+    if not match or int(match.group(1)) > int(match.group(2)):
+        raise ValidationError(f"Invalid seat range {columns}")
+    return range(int(match.group(1)), int(match.group(2)) + 1)
+
+
+def _selector_matches(selectors, row_labels):
+    """Turn a list of selectors into a set of (row, seat number) pairs, with None meaning a whole row."""
+    matches = set()
+    for selector in selectors:
+        match = SELECTOR_RE.match(str(selector).strip().upper())
+        if not match:
+            raise ValidationError(f"Invalid seat selector {selector}")
+        first_row, last_row, first_seat, last_seat = match.groups()
+
+        rows = _letter_range(first_row, last_row) if last_row else [first_row]
+        for row in rows:
+            if row not in row_labels:
+                raise ValidationError(f"Seat selector {selector} refers to unknown row {row}")
+            if first_seat is None:
+                matches.add((row, None))
+            else:
+                numbers = range(int(first_seat), int(last_seat or first_seat) + 1)
+                if not numbers or len(numbers) > MAX_LAYOUT_SEATS:
+                    raise ValidationError(f"Invalid seat range in seat selector {selector}")
+                for number in numbers:
+                    matches.add((row, number))
+    return matches
+
+
+def parse_layout_spec(spec):
+    """
+    Expand a compact layout spec into a list of (seat_number, seat_type).
+
+    {
+        "rows": "A-P",
+        "columns": "1-24",
+        "seat_types": {"VIP": ["H-J", "K5-20"]},
+        "gaps": ["A1-2", "P"]
+    }
+    Seats not listed in seat_types are "regular", seats listed in gaps are left out.
+    """
+    if "rows" not in spec or "columns" not in spec:
+        raise ValidationError("A layout needs rows and columns")
+
+    if not isinstance(spec.get("seat_types", {}), dict):
+        raise ValidationError("seat_types must map a seat type to a list of seat selectors")
+
+    rows = _parse_rows(spec["rows"])
+    columns = _parse_columns(spec["columns"])
+    if len(rows) * len(columns) > MAX_LAYOUT_SEATS:
+        raise ValidationError(f"A layout can have at most {MAX_LAYOUT_SEATS} seats")
+    gaps = _selector_matches(spec.get("gaps", []), rows)
+    types = [
+        (seat_type, _selector_matches(selectors, rows))
+        for seat_type, selectors in spec.get("seat_types", {}).items()
+    ]
+
+    seats = []
+    for row in rows:
+        for number in columns:
+            if (row, None) in gaps or (row, number) in gaps:
+                continue
+            seat_type = "regular"
+            for name, selected in types:
+                if (row, None) in selected or (row, number) in selected:
+                    seat_type = name
+            seats.append((f"{row}{number}", seat_type))
+    return seats
+
+
+def parse_layout_csv(text):
+    """Read seats from CSV lines of "seat_number,seat_type" (type optional, header optional)."""
+    seats = []
+    try:
+        for line in csv.reader(io.StringIO(text)):
+            if not line or not line[0].strip():
+                continue
+            seat_number = line[0].strip()
+            seat_type = line[1].strip() if len(line) > 1 and line[1].strip() else "regular"
+            if seat_number.lower() == "seat_number":
+                continue
+            seats.append((seat_number, seat_type))
+            if len(seats) > MAX_LAYOUT_SEATS:
+                raise ValidationError(f"A layout can have at most {MAX_LAYOUT_SEATS} seats")
+    except csv.Error as e:
+        raise ValidationError(f"Invalid CSV: {e}")
+    return seats
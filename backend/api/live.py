@@ -0,0 +1,152 @@
+import asyncio
+import json
+import threading
+import time
+from collections import defaultdict
+from functools import cache
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+# Events a slow client may fall behind by, after that it is told to reload the seat map
+SUBSCRIBER_QUEUE_SIZE = 100
+
+RESYNC = json.dumps({"resync": True})
+
+
+def seats_channel(show_id):
+    return f"seats:{show_id}"
+
+
+def _put(queue, message):
+    # runs on the subscriber's event loop
+    if queue.full():
+        # deltas are no use to a client this far behind, it reloads the seat map instead
+        while not queue.empty():
+            queue.get_nowait()
+        message = RESYNC
+    queue.put_nowait(message)
+
+
+class LocalBroker:
+    """
+    Fan-out of messages to the listeners in this process. Publishing is thread safe
+    (bookings run in worker threads), each listener has a queue on its own event loop.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.listeners = defaultdict(set)  # channel -> {(loop, queue)}
+
+    def publish(self, channel, message):
+        self.deliver(channel, message)
+
+    def deliver(self, channel, message):
+        with self.lock:
+            listeners = list(self.listeners.get(channel, ()))
+        for loop, queue in listeners:
+            try:
+                loop.call_soon_threadsafe(_put, queue, message)
+            except RuntimeError:
+                pass  # the loop was closed, the listener is going away
+
+    def deliver_all(self, message):
+        with self.lock:
+            channels = list(self.listeners)
+        for channel in channels:
+            self.deliver(channel, message)
+
+    def subscribe(self, channel):
+        """Start receiving the channel's messages, call from the event loop they are read on."""
+        subscription = Subscription(self, channel)
+        with self.lock:
+            self.listeners[channel].add(subscription.listener)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            listeners = self.listeners.get(subscription.channel)
+            if listeners is not None:
+                listeners.discard(subscription.listener)
+                if not listeners:
+                    del self.listeners[subscription.channel]
+
+
+class Subscription:
+    """A stream's queue of messages from one channel."""
+
+    def __init__(self, broker, channel):
+        self.broker = broker
+        self.channel = channel
+        self.listener = (asyncio.get_running_loop(), asyncio.Queue(SUBSCRIBER_QUEUE_SIZE))
+
+    async def messages(self, timeout):
+        """Messages as they come, None after `timeout` seconds without one. Unsubscribes when closed."""
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(self.listener[1].get(), timeout)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            self.broker.unsubscribe(self)
+
+
+class RedisBroker(LocalBroker):
+    """
+    Publishes through Redis pub/sub so the listeners of every worker get the messages
+    (needs the redis package). One thread per process reads them from Redis.
+    """
+
+    def __init__(self):
+        super().__init__()
+        import redis
+
+        self.redis = redis.Redis.from_url(settings.REDIS_URL)
+        self.reader = None
+
+    def publish(self, channel, message):
+        self.redis.publish(channel, message)
+
+    def subscribe(self, channel):
+        with self.lock:
+            if self.reader is None:
+                self.reader = threading.Thread(target=self.read, name="live-seats", daemon=True)
+                self.reader.start()
+        return super().subscribe(channel)
+
+    def read(self):
+        while True:
+            try:
+                pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe("seats:*")
+                for item in pubsub.listen():
+                    self.deliver(item["channel"].decode(), item["data"].decode())
+            except Exception:
+                # messages may have been missed while disconnected
+                self.deliver_all(RESYNC)
+                time.sleep(1)
+
+
+@cache
+def get_broker():
+    return import_string(settings.LIVE_SEATS_BROKER)()
+
+
+def _publish_on_commit(show_id, event):
+    message = json.dumps({"show": str(show_id), **event})
+    transaction.on_commit(lambda: get_broker().publish(seats_channel(show_id), message))
+
+
+def publish_seats(show_id, taken=(), freed=()):
+    """
+    Tell the show's live streams which ShowSeats were taken (booked or held) and which
+    became free, once the transaction commits.
+    """
+    _publish_on_commit(show_id, {"taken": list(taken), "freed": list(freed)})
+
+
+def publish_show_cancelled(show_id):
+    _publish_on_commit(show_id, {"cancelled": True})
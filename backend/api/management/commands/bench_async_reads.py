@@ -0,0 +1,182 @@
+import asyncio
+import threading
+import time
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.test import RequestFactory
+from django.utils import timezone
+
+from api.models import Movie, Show
+
+from .load_test import percentile
+from .seed_benchmark_data import PREFIX
+
+
+def wsgi_get(application, path):
+    """(status, body) of a GET through the WSGI application, in this thread."""
+    environ = RequestFactory().get(path, HTTP_ACCEPT='application/json').environ
+    started = {}
+    body = b''.join(application(environ, lambda status, headers: started.setdefault('status', status)))
+    return int(started['status'].split()[0]), body
+
+
+async def asgi_get(application, path):
+    """(status, body) of a GET through the ASGI application, on this event loop."""
+    path, _, query = path.partition('?')
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': query.encode(),
+        'root_path': '', 'headers': [(b'host', b'localhost'), (b'accept', b'application/json')],
+        'client': ('127.0.0.1', 0), 'server': ('localhost', 80),
+    }
+    disconnected = asyncio.Event()
+    requested = False
+    messages = []
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await disconnected.wait()  # the client stays connected until the response is sent
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        messages.append(message)
+
+    await application(scope, receive, send)
+    disconnected.set()
+    status = next(m['status'] for m in messages if m['type'] == 'http.response.start')
+    return status, b''.join(m.get('body', b'') for m in messages if m['type'] == 'http.response.body')
+
+
+def http_get(base_url, path):
+    try:
+        with urlopen(Request(base_url.rstrip('/') + path, headers={'Accept': 'application/json'})) as response:
+            return response.status, response.read()
+    except HTTPError as e:
+        return e.code, e.read()
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare requests/s and tail latency of the read endpoints served by the sync views under WSGI '
+        'and by the async views under ASGI (backend/asgi.py), with the same number of concurrent clients. '
+        'In-process by default, WSGI with one thread per client and ASGI with all clients on one event loop; '
+        'with --wsgi-url/--asgi-url against running servers (e.g. gunicorn and uvicorn with equal --workers). '
+        'Seed data with seed_benchmark_data first.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=16, help='Concurrent clients')
+        parser.add_argument('--duration', type=float, default=15, help='Seconds per server')
+        parser.add_argument('--wsgi-url', help='Running WSGI server, e.g. http://localhost:8000')
+        parser.add_argument('--asgi-url', help='Running ASGI server, e.g. http://localhost:8001')
+
+    def handle(self, *args, **options):
+        paths = self.paths()
+        if bool(options['wsgi_url']) != bool(options['asgi_url']):
+            raise CommandError('Give both --wsgi-url and --asgi-url, or neither')
+
+        if options['wsgi_url']:
+            wsgi = lambda path: http_get(options['wsgi_url'], path)  # noqa: E731
+            asgi = lambda path: http_get(options['asgi_url'], path)  # noqa: E731
+            runs = [('WSGI', self.run_threads, wsgi), ('ASGI', self.run_threads, asgi)]
+        else:
+            from backend.asgi import application as asgi_application
+            wsgi_application = get_wsgi_application()
+            wsgi = lambda path: wsgi_get(wsgi_application, path)  # noqa: E731
+            asgi = lambda path: asgi_get(asgi_application, path)  # noqa: E731
+            runs = [('WSGI', self.run_threads, wsgi), ('ASGI', self.run_event_loop, asgi)]
+
+        # both must send the same bodies, compared on a cold cache
+        for path in paths:
+            cache.clear()
+            expected = wsgi(path)
+            cache.clear()
+            got = asgi(path) if options['wsgi_url'] else asyncio.run(asgi(path))
+            if expected != got:
+                self.stdout.write(self.style.WARNING(f'{path}: WSGI and ASGI responses differ ({expected[0]} / {got[0]})'))
+
+        for name, run, get in runs:
+            samples = run(get, paths, options['clients'], options['duration'])
+            self.report(name, samples, options['duration'])
+
+    def paths(self):
+        movie = Movie.objects.filter(title__startswith=f'{PREFIX} ', shows__showtime__gt=timezone.now()).first()
+        show = Show.objects.filter(movie__title__startswith=f'{PREFIX} ', showtime__gt=timezone.now()).first()
+        if movie is None or show is None:
+            raise CommandError('No benchmark data, run seed_benchmark_data first')
+        return [
+            '/api/movies/',
+            '/api/movies/?ordering=-average_rating&page_size=50',
+            f'/api/shows/?movie={movie.id}',
+            '/api/schedule/',
+            f'/api/schedule/?movie={movie.id}',
+            f'/api/shows/{show.id}/seatmap/',
+        ]
+
+    def run_threads(self, get, paths, clients, duration):
+        """[(path, ms, status)] of `clients` threads requesting the paths in turn for `duration` seconds."""
+        samples = []
+        lock = threading.Lock()
+        deadline = time.perf_counter() + duration
+
+        def client(offset):
+            try:
+                n = offset
+                while time.perf_counter() < deadline:
+                    path = paths[n % len(paths)]
+                    start = time.perf_counter()
+                    status, _ = get(path)
+                    with lock:
+                        samples.append((path, (time.perf_counter() - start) * 1000, status))
+                    n += 1
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return samples
+
+    def run_event_loop(self, get, paths, clients, duration):
+        """run_threads with the clients as tasks on one event loop."""
+        samples = []
+
+        async def client(offset, deadline):
+            n = offset
+            while time.perf_counter() < deadline:
+                path = paths[n % len(paths)]
+                start = time.perf_counter()
+                status, _ = await get(path)
+                samples.append((path, (time.perf_counter() - start) * 1000, status))
+                n += 1
+
+        async def main():
+            deadline = time.perf_counter() + duration
+            await asyncio.gather(*(client(n, deadline) for n in range(clients)))
+
+        asyncio.run(main())
+        return samples
+
+    def report(self, name, samples, duration):
+        timings = [ms for _, ms, _ in samples]
+        errors = sum(1 for _, _, status in samples if status >= 500)
+        self.stdout.write(self.style.SUCCESS(
+            f'{name}: {len(samples) / duration:.1f} req/s, p50 {percentile(timings, 50):.1f} ms, '
+            f'p95 {percentile(timings, 95):.1f} ms, p99 {percentile(timings, 99):.1f} ms, {errors} errors'
+        ))
+        for path in sorted({path for path, _, _ in samples}):
+            timings = [ms for p, ms, _ in samples if p == path]
+            self.stdout.write(
+                f'  {path}: {len(timings)} requests, p50 {percentile(timings, 50):.1f} ms, '
+                f'p99 {percentile(timings, 99):.1f} ms'
+            )
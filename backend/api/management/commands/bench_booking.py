@@ -0,0 +1,88 @@
+import random
+import threading
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.models import Movie, Theater, Seat, Show, ShowSeat
+
+
+class Command(BaseCommand):
+    help = 'Benchmark concurrent ticket booking on a single hot show'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seats', type=int, default=300, help='Seats in the benchmark show')
+        parser.add_argument('--users', type=int, default=8, help='Concurrent booking threads')
+        parser.add_argument('--seats-per-booking', type=int, default=2, help='Seats picked per booking')
+
+    def handle(self, *args, **options):
+        seat_count = options['seats']
+        users = options['users']
+        per_booking = options['seats_per_booking']
+
+        movie = Movie.objects.create(
+            title='Benchmark Movie', synopsis='', genre='Benchmark', runtime_minutes=120,
+            release_date=timezone.now().date(), poster_url='https://example.com/poster.jpg'
+        )
+        theater = Theater.objects.create(name='Benchmark Theater', address='', total_seats=seat_count)
+        Seat.objects.bulk_create([
+            Seat(theater=theater, seat_number=f'S{n}') for n in range(1, seat_count + 1)
+        ])
+        show = Show.objects.create(
+            movie=movie, theater=theater, showtime=timezone.now() + timedelta(days=7), price=10
+        )
+        ShowSeat.objects.bulk_create([ShowSeat(show=show, seat=seat) for seat in theater.seats.all()])
+        showseat_ids = list(show.show_seats.values_list('id', flat=True))
+        user, _ = User.objects.get_or_create(username='benchmark-user')
+
+        try:
+            # one booking on its own to count the queries it needs
+            client = APIClient()
+            client.force_authenticate(user)
+            with CaptureQueriesContext(connection) as queries:
+                client.post('/api/tickets/', {'show': str(show.id), 'seat_ids': showseat_ids[:per_booking]}, format='json')
+            self.stdout.write(f'Queries per booking: {len(queries)}')
+
+            results = {'booked': 0, 'conflicts': 0}
+            lock = threading.Lock()
+
+            def book():
+                client = APIClient()
+                client.force_authenticate(user)
+                try:
+                    while True:
+                        free = list(ShowSeat.objects.filter(show=show, is_booked=False).values_list('id', flat=True)[:per_booking * 4])
+                        if len(free) < per_booking:
+                            return
+                        response = client.post(
+                            '/api/tickets/',
+                            {'show': str(show.id), 'seat_ids': random.sample(free, per_booking)},
+                            format='json'
+                        )
+                        with lock:
+                            results['booked' if response.status_code == 201 else 'conflicts'] += 1
+                finally:
+                    connection.close()
+
+            threads = [threading.Thread(target=book) for _ in range(users)]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+
+            self.stdout.write(f'Bookings: {results["booked"]}, conflicts: {results["conflicts"]}')
+            self.stdout.write(self.style.SUCCESS(
+                f'{results["booked"] / elapsed:.1f} bookings/sec with {users} concurrent users'
+            ))
+        finally:
+            # removes the show, seats and tickets through cascades
+            theater.delete()
+            movie.delete()
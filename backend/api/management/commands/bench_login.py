@@ -0,0 +1,126 @@
+import threading
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.views import TokenObtainPairView
+
+from api.models import Movie, Theater, Seat, Show, ShowSeat, Ticket
+from api.passwords import get_hashing_pool
+
+from .load_test import percentile
+
+
+PASSWORD = 'bench-login-password'
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure login throughput and booking latency while logins and bookings run at the same time, '
+        'with password hashing in the request threads and on the hashing pool (api/passwords.py). '
+        'Logins go to the token view without its throttles. Test data is removed afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=8, help='Concurrent login threads')
+        parser.add_argument('--bookers', type=int, default=4, help='Concurrent booking threads')
+        parser.add_argument('--duration', type=float, default=10, help='Seconds per run')
+        parser.add_argument('--workers', type=int, default=2, help='Hashing pool threads')
+
+    def handle(self, *args, **options):
+        movie = Movie.objects.create(
+            title='Login Benchmark Movie', synopsis='', genre='Benchmark', runtime_minutes=120,
+            release_date=timezone.now().date(), poster_url='https://example.com/poster.jpg'
+        )
+        theater = Theater.objects.create(name='Login Benchmark Theater', address='')
+        Seat.objects.bulk_create([
+            Seat(theater=theater, seat_number=f'S{n}') for n in range(1, options['bookers'] + 1)
+        ])
+        show = Show.objects.create(movie=movie, theater=theater, showtime=timezone.now() + timedelta(days=7), price=10)
+        ShowSeat.create_for_shows([show])
+        booker = User.objects.create_user('bench-login-booker')
+        User.objects.create_user('bench-login-user', password=PASSWORD)
+
+        try:
+            runs = [
+                ('bookings alone', 0, options['workers']),
+                ('hashing in request threads', options['logins'], 0),
+                (f'hashing pool of {options["workers"]}', options['logins'], options['workers']),
+            ]
+            for name, logins, workers in runs:
+                with override_settings(PASSWORD_HASHING_WORKERS=workers):
+                    get_hashing_pool.cache_clear()
+                    bookings, login_samples = self.run(show, booker, logins, options['bookers'], options['duration'])
+                    if get_hashing_pool():
+                        get_hashing_pool().shutdown()
+                get_hashing_pool.cache_clear()
+                self.report(name, bookings, login_samples, options['duration'])
+        finally:
+            # removes the show, seats and tickets through cascades
+            theater.delete()
+            movie.delete()
+            User.objects.filter(username__startswith='bench-login-').delete()
+
+    def run(self, show, booker, logins, bookers, duration):
+        """([(ms, status)] of the bookings, [(ms, status)] of the logins) over `duration` seconds."""
+        bookings, login_samples = [], []
+        lock = threading.Lock()
+        deadline = time.perf_counter() + duration
+        showseat_ids = list(show.show_seats.values_list('id', flat=True))
+
+        def book(showseat_id):
+            # books its own seat and deletes the ticket again, so bookings never run out of seats
+            client = APIClient()
+            client.force_authenticate(booker)
+            try:
+                while time.perf_counter() < deadline:
+                    start = time.perf_counter()
+                    response = client.post('/api/tickets/', {'show': str(show.id), 'seat_ids': [showseat_id]}, format='json')
+                    with lock:
+                        bookings.append(((time.perf_counter() - start) * 1000, response.status_code))
+                    if response.status_code == 201:
+                        client.delete(f'/api/tickets/{response.data["id"]}/')
+            finally:
+                connection.close()
+
+        def login():
+            view = TokenObtainPairView.as_view()
+            factory = RequestFactory()
+            try:
+                while time.perf_counter() < deadline:
+                    request = factory.post(
+                        '/api/token/', {'username': 'bench-login-user', 'password': PASSWORD},
+                        content_type='application/json'
+                    )
+                    start = time.perf_counter()
+                    response = view(request)
+                    with lock:
+                        login_samples.append(((time.perf_counter() - start) * 1000, response.status_code))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=book, args=(showseat_ids[n],)) for n in range(bookers)]
+        threads += [threading.Thread(target=login) for _ in range(logins)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        Ticket.objects.filter(show=show).delete()
+        return bookings, login_samples
+
+    def report(self, name, bookings, login_samples, duration):
+        self.stdout.write(self.style.SUCCESS(name))
+        for label, samples, ok in (('bookings', bookings, 201), ('logins', login_samples, 200)):
+            if not samples:
+                continue
+            timings = [ms for ms, _ in samples]
+            errors = sum(1 for _, status in samples if status != ok)
+            self.stdout.write(
+                f'  {label}: {len(samples) / duration:.1f}/s, p50 {percentile(timings, 50):.1f} ms, '
+                f'p99 {percentile(timings, 99):.1f} ms, {errors} failed'
+            )
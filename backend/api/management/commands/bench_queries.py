@@ -0,0 +1,105 @@
+import json
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, migrations, transaction
+from django.db.migrations.loader import MigrationLoader
+from django.db.models import Count
+from django.utils import timezone
+
+from api.models import Movie, Show, ShowSeat, Ticket, Review, free_seat_q
+
+
+# the migration with the indexes for these queries, --without-indexes runs without them
+INDEX_MIGRATION = '0008_query_pattern_indexes'
+
+
+class Command(BaseCommand):
+    help = (
+        'Show EXPLAIN plans and latency of the hot queries. Seed data with seed_benchmark_data, '
+        'then compare a run with --without-indexes (the baseline) to one without.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=20, help='Timed runs per query')
+        parser.add_argument('--analyze', action='store_true', help='Use EXPLAIN ANALYZE (PostgreSQL)')
+        parser.add_argument('--json', dest='json_path', help='Also write the results to this JSON file')
+        parser.add_argument(
+            '--without-indexes', action='store_true',
+            help=f'Drop the indexes of api {INDEX_MIGRATION} for the run, in a transaction that is '
+                 'rolled back (needs transactional DDL: PostgreSQL or SQLite)'
+        )
+
+    def queries(self):
+        """The filters behind the busiest endpoints, on a busy movie, show and user."""
+        now = timezone.now()
+        movie = Movie.objects.annotate(n=Count('shows')).order_by('-n').first()
+        show = Show.objects.filter(movie=movie).order_by('-showtime').first()
+        user = User.objects.annotate(n=Count('tickets')).order_by('-n').first()
+        if not (movie and show and user):
+            raise CommandError('No data to query, run seed_benchmark_data first')
+
+        return {
+            'shows for a movie (booking page)': Show.objects.filter(
+                movie=movie, is_active=True, showtime__gte=now
+            ).order_by('showtime'),
+            'shows for a movie in a theater': Show.objects.filter(
+                movie=movie, theater_id=show.theater_id, is_active=True
+            ).order_by('showtime'),
+            'free seats of a show': ShowSeat.objects.filter(free_seat_q(), show=show),
+            'tickets of a user (order history)': Ticket.objects.filter(user=user).order_by('-booking_time')[:100],
+            'paid tickets of a show': Ticket.objects.filter(show=show, status='paid'),
+            'reviews of a movie': Review.objects.filter(movie=movie).order_by('-created_at')[:100],
+            'current movies (catalog)': Movie.objects.filter(is_current=True).order_by('-created_at')[:100],
+            'movies by genre': Movie.objects.filter(genre=movie.genre),
+            'expired seat holds': ShowSeat.objects.filter(held_until__lte=now),
+        }
+
+    def handle(self, *args, **options):
+        if not options['without_indexes']:
+            return self.run(options)
+        if not connection.features.can_rollback_ddl:
+            raise CommandError(f'{connection.vendor} cannot drop indexes in a transaction')
+        # SQLite's schema editor wants foreign key checks off before the transaction starts
+        with connection.constraint_checks_disabled(), transaction.atomic():
+            self.drop_indexes()
+            self.run(options)
+            transaction.set_rollback(True)
+
+    def drop_indexes(self):
+        loader = MigrationLoader(connection)
+        migration = loader.get_migration('api', INDEX_MIGRATION)
+        state = loader.project_state(('api', INDEX_MIGRATION))
+        with connection.schema_editor(atomic=False) as schema_editor:
+            for operation in migration.operations:
+                if isinstance(operation, migrations.AddIndex):
+                    model = state.apps.get_model('api', operation.model_name)
+                    schema_editor.remove_index(model, operation.index)
+                    self.stdout.write(f'Without index {operation.index.name}')
+
+    def run(self, options):
+        results = {}
+        for name, queryset in self.queries().items():
+            plan = queryset.explain(analyze=True) if options['analyze'] else queryset.explain()
+
+            timings = []
+            for _ in range(options['runs']):
+                start = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - start) * 1000)
+
+            results[name] = {
+                'median_ms': round(statistics.median(timings), 3),
+                'max_ms': round(max(timings), 3),
+                'plan': plan,
+            }
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(plan)
+            self.stdout.write(f'median {results[name]["median_ms"]} ms, max {results[name]["max_ms"]} ms\n')
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as f:
+                json.dump({'database': connection.vendor, 'queries': results}, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Wrote {options["json_path"]}'))
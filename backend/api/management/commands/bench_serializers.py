@@ -0,0 +1,126 @@
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from api.fast_serializers import compile_serializer
+from api.models import Movie, Theater, Seat, Show, ShowSeat, Ticket, TicketSeat, Review
+from api.renderers import FastJSONRenderer, orjson
+from api.serializers import (
+    MovieSerializer, ShowSerializer, ShowSummarySerializer, ShowSeatSerializer,
+    TicketSerializer, ReviewSerializer
+)
+from api.views import ShowViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the throughput of the DRF serializers and their compiled versions (api/fast_serializers.py), '
+        'and of JSONRenderer and FastJSONRenderer, on the read endpoints. Fails if the compiled output '
+        'is not byte for byte the same. Test data is created in a transaction that is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help='Rows serialized per round')
+        parser.add_argument('--rounds', type=int, default=20)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING('orjson is not installed, FastJSONRenderer uses the json module'))
+
+        mismatches = []
+        with transaction.atomic():
+            for name, serializer_class, rows in self.cases(options['rows']):
+                drf_bytes, drf_serialize, drf_render = self.measure(
+                    lambda: serializer_class(rows, many=True).data, JSONRenderer(), options['rounds']
+                )
+                compiled = compile_serializer(serializer_class)
+                fast_bytes, fast_serialize, fast_render = self.measure(
+                    lambda: compiled.many(rows), FastJSONRenderer(), options['rounds']
+                )
+
+                same = drf_bytes == fast_bytes
+                if not same:
+                    mismatches.append(name)
+                per_second = len(rows) * options['rounds']
+                self.stdout.write(
+                    f'{name} ({len(rows)} rows, {len(drf_bytes)} bytes): '
+                    f'serialize {per_second / drf_serialize:.0f} -> {per_second / fast_serialize:.0f} rows/s '
+                    f'({drf_serialize / fast_serialize:.1f}x), '
+                    f'render {per_second / drf_render:.0f} -> {per_second / fast_render:.0f} rows/s '
+                    f'({drf_render / fast_render:.1f}x)'
+                    + ('' if same else self.style.ERROR(', output differs'))
+                )
+            transaction.set_rollback(True)
+
+        if mismatches:
+            raise CommandError(f'Compiled output differs for: {", ".join(mismatches)}')
+        self.stdout.write(self.style.SUCCESS('Compiled output is byte for byte the same'))
+
+    def measure(self, serialize, renderer, rounds):
+        """(rendered bytes, seconds serializing, seconds rendering) over the rounds."""
+        serialize_seconds = render_seconds = 0.0
+        for _ in range(rounds):
+            start = time.perf_counter()
+            data = serialize()
+            rendered = time.perf_counter()
+            body = renderer.render(data)
+            serialize_seconds += rendered - start
+            render_seconds += time.perf_counter() - rendered
+        return body, serialize_seconds, render_seconds
+
+    def cases(self, count):
+        """(name, serializer class, rows) of each endpoint, rows loaded the way the view loads them."""
+        movies = Movie.objects.bulk_create([
+            Movie(
+                title=f'Bench Movie {n}', synopsis='A film about benchmarks — “quoted”', genre='Benchmark',
+                cast=['Ada', 'Grace'], runtime_minutes=90 + n % 60, release_date=timezone.now().date(),
+                rating=n % 10 + 0.5, poster_url='https://example.com/poster.jpg'
+            )
+            for n in range(count)
+        ])
+        theater = Theater.objects.create(name='Bench Theater', address='')
+        Seat.objects.bulk_create([
+            Seat(theater=theater, seat_number=f'S{n}', seat_type='VIP' if n % 5 == 0 else 'Regular')
+            for n in range(1, count + 1)
+        ])
+        shows = Show.objects.bulk_create([
+            Show(movie=movies[n], theater=theater, showtime=timezone.now() + timedelta(hours=n + 1), price='12.50')
+            for n in range(count)
+        ])
+        ShowSeat.create_for_shows(shows[:1])
+        seats = list(theater.seats.all())
+
+        user = User.objects.create_user('bench-user')
+        tickets = Ticket.objects.bulk_create([
+            Ticket(user=user, show=shows[n % len(shows)], total_price='25.00') for n in range(count)
+        ])
+        TicketSeat.objects.bulk_create([
+            TicketSeat(ticket=ticket, seat=seats[n % len(seats)]) for n, ticket in enumerate(tickets)
+        ])
+        Review.objects.bulk_create([
+            Review(movie=movies[n], user=user, rating=n % 5 + 0.5, comment='Fine') for n in range(count)
+        ])
+
+        show_ids = [show.id for show in shows]
+        return [
+            ('movies', MovieSerializer, list(Movie.objects.defer('search_vector').filter(pk__in=[m.pk for m in movies]))),
+            ('shows', ShowSummarySerializer, list(
+                ShowViewSet.with_seat_counts(Show.objects.select_related('movie', 'theater').filter(id__in=show_ids))
+            )),
+            ('show detail', ShowSerializer, list(
+                Show.objects.select_related('movie', 'theater').prefetch_related('show_seats__seat').filter(id=shows[0].id)
+            )),
+            ('show seats', ShowSeatSerializer, list(ShowSeat.objects.select_related('show', 'seat').filter(show=shows[0]))),
+            ('tickets', TicketSerializer, list(
+                Ticket.objects.filter(user=user).select_related('user', 'show__movie', 'show__theater').prefetch_related(
+                    Prefetch('ticket_seats', queryset=TicketSeat.objects.select_related('seat'))
+                )
+            )),
+            ('reviews', ReviewSerializer, list(Review.objects.select_related('movie', 'user').filter(user=user))),
+        ]
@@ -0,0 +1,98 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.authentication import ClaimsTokenObtainPairSerializer
+from api.metrics import query_budget
+from api.models import Movie, Theater, Seat, Show, ShowSeat, Ticket, TicketSeat
+
+
+# Most queries each endpoint may run, however much data there is. Requests carry a JWT
+# like the frontend's, whose claims are enough to authenticate without a query.
+TICKET_LIST_BUDGET = 2  # tickets joined with show/movie/theater, then their seats
+TICKET_DETAIL_BUDGET = 2
+# the ticket joined with its show, seats and ShowSeats, then the writes. The savepoint
+# and its release are counted too (these checks run inside a transaction).
+TICKET_UPDATE_BUDGET = 2  # the ticket, its UPDATE
+TICKET_CANCEL_BUDGET = 6  # the ticket, savepoint, UPDATE ticket, ShowSeats and seat version, release
+TICKET_DESTROY_BUDGET = 9  # as cancel, then the DELETEs of its TicketSeats, Payment and the ticket
+ME_BUDGET = 1  # the user joined with the profile, then it is cached
+
+
+class Command(BaseCommand):
+    help = (
+        'Check that endpoints stay within their query budgets with little and with a lot of data, '
+        'to catch N+1 queries. Test data is created in a transaction that is rolled back.'
+    )
+
+    def handle(self, *args, **options):
+        failures = []
+        with transaction.atomic():
+            for name, budget, user, method, path in self.checks():
+                client = APIClient()
+                token = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+                client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+                try:
+                    with query_budget(budget) as queries:
+                        response = getattr(client, method)(path, format='json')
+                    if response.status_code >= 300:
+                        raise AssertionError(f'status {response.status_code}')
+                    self.stdout.write(f'{name}: {queries.queries} queries (budget {budget})')
+                except AssertionError as e:
+                    failures.append(name)
+                    self.stdout.write(self.style.ERROR(f'{name}: {e}'))
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f'{len(failures)} endpoints over their query budget')
+        self.stdout.write(self.style.SUCCESS('All endpoints within their query budgets'))
+
+    def checks(self):
+        """(name, budget, user, method, path) of each request to check, with the data they need."""
+        movie = Movie.objects.create(
+            title='Budget Movie', synopsis='', genre='Benchmark', runtime_minutes=120,
+            release_date=timezone.now().date(), poster_url='https://example.com/poster.jpg'
+        )
+        theater = Theater.objects.create(name='Budget Theater', address='')
+        Seat.objects.bulk_create([Seat(theater=theater, seat_number=f'S{n}') for n in range(1, 101)])
+        shows = [
+            Show.objects.create(movie=movie, theater=theater, showtime=timezone.now() + timedelta(days=n + 1), price=10)
+            for n in range(3)
+        ]
+        ShowSeat.create_for_shows(shows)
+        seats = list(theater.seats.all())
+
+        one = User.objects.create_user('budget-one')
+        many = User.objects.create_user('budget-many')
+        staff = User.objects.create_user('budget-staff', is_staff=True)
+        self.book(one, shows[:1], seats, 1)
+        tickets = self.book(many, shows, seats, 25)
+
+        return [
+            ('ticket list, 1 ticket', TICKET_LIST_BUDGET, one, 'get', '/api/tickets/'),
+            ('ticket list, 25 tickets', TICKET_LIST_BUDGET, many, 'get', '/api/tickets/'),
+            ('ticket list, staff', TICKET_LIST_BUDGET, staff, 'get', '/api/tickets/'),
+            ('bookings list', TICKET_LIST_BUDGET, many, 'get', '/api/bookings/'),
+            ('ticket detail', TICKET_DETAIL_BUDGET, many, 'get', f'/api/tickets/{tickets[0].id}/'),
+            ('ticket update', TICKET_UPDATE_BUDGET, many, 'patch', f'/api/tickets/{tickets[1].id}/'),
+            ('ticket cancel', TICKET_CANCEL_BUDGET, many, 'post', f'/api/tickets/{tickets[2].id}/cancel_ticket/'),
+            ('ticket destroy', TICKET_DESTROY_BUDGET, many, 'delete', f'/api/tickets/{tickets[3].id}/'),
+            ('booking delete', TICKET_DESTROY_BUDGET, many, 'delete', f'/api/bookings/delete/{tickets[4].id}/'),
+            ('me', ME_BUDGET, one, 'get', '/api/user/me/'),
+        ]
+
+    def book(self, user, shows, seats, count):
+        """`count` tickets of two seats each for the user, spread over the shows."""
+        tickets = Ticket.objects.bulk_create([
+            Ticket(user=user, show=shows[n % len(shows)], total_price=20) for n in range(count)
+        ])
+        TicketSeat.objects.bulk_create([
+            TicketSeat(ticket=ticket, seat=seat)
+            for n, ticket in enumerate(tickets)
+            for seat in seats[2 * n:2 * n + 2]
+        ])
+        return tickets
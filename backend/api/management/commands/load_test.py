@@ -0,0 +1,219 @@
+import json
+import math
+import random
+import subprocess
+import threading
+import time
+from collections import defaultdict
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.test import APIClient
+
+from api.models import Movie
+
+from .seed_benchmark_data import PREFIX
+
+
+# password given to the virtual users when driving a server over HTTP
+LOAD_TEST_PASSWORD = 'load-test-password'
+
+# status recorded for a request that got no response (connection refused, reset, timed out)
+NO_RESPONSE = 0
+
+
+def percentile(values, percent):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(percent / 100 * len(ordered)) - 1, 0)]
+
+
+def free_seats(seat_map):
+    """ShowSeat ids of the available seats in a compact seat map (see api/seatmap.py)."""
+    ids = [first + n for first, count in seat_map['ids'] for n in range(count)]
+    free = []
+    position = 0
+    for index, length in enumerate(seat_map['booked']):
+        if index % 2 == 0:  # runs alternate available/taken, starting with available
+            free.extend(ids[position:position + length])
+        position += length
+    return free
+
+
+class InProcessClient:
+    """Requests through the full Django stack in this process, with a query count for each."""
+
+    def __init__(self, user):
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def request(self, method, path, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(path, data, format='json')
+        body = response.json() if response.content and response.get('Content-Type', '').startswith('application/json') else None
+        return response.status_code, body, len(queries)
+
+
+class HttpClient:
+    """Requests to a running server, logged in with a JWT. Query counts aren't known here."""
+
+    def __init__(self, base_url, user):
+        self.base_url = base_url.rstrip('/')
+        self.token = None
+        status, body, _ = self.request('post', '/api/token/', {'username': user.username, 'password': LOAD_TEST_PASSWORD})
+        if status != 200:
+            raise CommandError(f'Could not log in as {user.username}: {status}')
+        self.token = body['access']
+
+    def request(self, method, path, data=None):
+        headers = {'Content-Type': 'application/json'}
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+        body = json.dumps(data).encode() if method == 'post' else None
+        request = Request(self.base_url + path, data=body, headers=headers, method=method.upper())
+        try:
+            with urlopen(request) as response:
+                return response.status, json.loads(response.read() or 'null'), None
+        except HTTPError as e:
+            return e.code, None, None
+        except (URLError, OSError):
+            return NO_RESPONSE, None, None
+
+
+class Command(BaseCommand):
+    help = (
+        'Drive the booking hot path with concurrent virtual users and report p50/p95/p99 latency, '
+        'throughput and query counts per endpoint. Seed data with seed_benchmark_data first.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10, help='Concurrent virtual users')
+        parser.add_argument('--duration', type=float, default=30, help='Seconds to run')
+        parser.add_argument('--cancel-rate', type=float, default=0.3, help='Share of bookings cancelled right after')
+        parser.add_argument('--base-url', help='Drive a running server (e.g. http://localhost:8000) instead of in-process')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed, for repeatable runs')
+        parser.add_argument('--json', dest='json_path', help='Also write the results to this JSON file')
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        movie_ids = [
+            str(pk) for pk in Movie.objects.filter(
+                title__startswith=f'{PREFIX} ', shows__is_active=True, shows__showtime__gt=timezone.now()
+            ).distinct().values_list('pk', flat=True)
+        ]
+        users = list(User.objects.filter(username__startswith=f'{PREFIX}-').order_by('id')[:options['users']])
+        if not movie_ids or len(users) < options['users']:
+            raise CommandError('Not enough benchmark data, run seed_benchmark_data first')
+
+        if options['base_url']:
+            User.objects.filter(pk__in=[user.pk for user in users]).update(password=make_password(LOAD_TEST_PASSWORD))
+
+        samples = defaultdict(list)  # endpoint -> [(ms, status, queries)]
+        lock = threading.Lock()
+        deadline = time.perf_counter() + options['duration']
+
+        def virtual_user(user, rng):
+            try:
+                if options['base_url']:
+                    client = HttpClient(options['base_url'], user)
+                else:
+                    client = InProcessClient(user)
+
+                def call(endpoint, method, path, data=None):
+                    start = time.perf_counter()
+                    status, body, queries = client.request(method, path, data)
+                    elapsed = (time.perf_counter() - start) * 1000
+                    with lock:
+                        samples[endpoint].append((elapsed, status, queries))
+                    return status, body
+
+                while time.perf_counter() < deadline:
+                    call('GET /api/movies/', 'get', '/api/movies/')
+                    _, shows = call('GET /api/shows/', 'get', f'/api/shows/?movie={rng.choice(movie_ids)}')
+                    now = timezone.now()
+                    upcoming = [
+                        show for show in shows or []
+                        if show['is_active'] and show['available_seats'] and parse_datetime(show['showtime']) > now
+                    ]
+                    if not upcoming:
+                        continue
+
+                    show = rng.choice(upcoming)
+                    _, seat_map = call('GET seatmap', 'get', f'/api/shows/{show["id"]}/seatmap/')
+                    seats = free_seats(seat_map) if seat_map else []
+                    if not seats:
+                        continue
+
+                    picked = rng.sample(seats, min(len(seats), rng.randint(1, 4)))
+                    status, ticket = call('POST /api/tickets/', 'post', '/api/tickets/', {'show': show['id'], 'seat_ids': picked})
+                    if status == 201 and rng.random() < options['cancel_rate']:
+                        call('POST cancel_ticket', 'post', f'/api/tickets/{ticket["id"]}/cancel_ticket/', {})
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=virtual_user, args=(user, random.Random(random.random())))
+            for user in users
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        results = self.summarize(samples, elapsed)
+        for endpoint, row in results.items():
+            queries = f', queries avg {row["queries_avg"]} max {row["queries_max"]}' if row['queries_avg'] is not None else ''
+            self.stdout.write(
+                f'{endpoint}: {row["requests"]} requests ({row["errors"]} errors), {row["throughput_rps"]} req/s, '
+                f'p50 {row["p50_ms"]} ms, p95 {row["p95_ms"]} ms, p99 {row["p99_ms"]} ms{queries}'
+            )
+        total = sum(row['requests'] for row in results.values())
+        self.stdout.write(self.style.SUCCESS(f'{total} requests in {elapsed:.1f}s, {total / elapsed:.1f} req/s'))
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as f:
+                json.dump({
+                    'commit': self.commit(),
+                    'database': connection.vendor,
+                    'target': options['base_url'] or 'in-process',
+                    'users': options['users'],
+                    'duration_s': round(elapsed, 2),
+                    'throughput_rps': round(total / elapsed, 1),
+                    'endpoints': results,
+                }, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Wrote {options["json_path"]}'))
+
+    def summarize(self, samples, elapsed):
+        results = {}
+        for endpoint, rows in samples.items():
+            timings = [ms for ms, _, _ in rows]
+            queries = [n for _, _, n in rows if n is not None]
+            results[endpoint] = {
+                'requests': len(rows),
+                # rejected bookings (seat taken by another user) are conflicts, not errors
+                'errors': sum(1 for _, status, _ in rows if status >= 500 or status == NO_RESPONSE),
+                'conflicts': sum(1 for _, status, _ in rows if 400 <= status < 500),
+                'throughput_rps': round(len(rows) / elapsed, 1),
+                'p50_ms': round(percentile(timings, 50), 2),
+                'p95_ms': round(percentile(timings, 95), 2),
+                'p99_ms': round(percentile(timings, 99), 2),
+                'queries_avg': round(sum(queries) / len(queries), 1) if queries else None,
+                'queries_max': max(queries) if queries else None,
+            }
+        return results
+
+    def commit(self):
+        """The checked out commit, so results can be compared across commits."""
+        try:
+            return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True).stdout.strip() or None
+        except OSError:
+            return None
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api.models import Movie
+
+
+class Command(BaseCommand):
+    help = 'Recompute review counts and average ratings of all movies from their reviews'
+
+    def handle(self, *args, **options):
+        updated = Movie.rebuild_review_aggregates()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt review aggregates for {updated} movies'))
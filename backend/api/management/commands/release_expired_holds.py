@@ -0,0 +1,31 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from api.live import publish_seats
+from api.models import SeatHold, ShowSeat
+
+
+class Command(BaseCommand):
+    help = 'Release seats of expired seat holds (run periodically, e.g. from cron)'
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+
+        # Expired holds already count as free when reading, this only clears them out
+        # and tells the live seat streams (see api/live.py) that the seats are free
+        with transaction.atomic():
+            expired = ShowSeat.objects.filter(held_until__lte=now)
+            freed = defaultdict(list)
+            for show_id, seat_id in expired.select_for_update().values_list("show_id", "id"):
+                freed[show_id].append(seat_id)
+            released = expired.update(hold=None, held_until=None)
+            deleted, _ = SeatHold.objects.filter(expires_at__lte=now).delete()
+            for show_id, seat_ids in freed.items():
+                publish_seats(show_id, freed=seat_ids)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Released {released} seats from {deleted} expired holds')
+        )
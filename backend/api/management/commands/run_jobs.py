@@ -0,0 +1,47 @@
+import os
+import socket
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from api.jobs import claim_jobs, run_job
+from api.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (ticket issuing and other post-booking work). Keeps polling for new jobs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', type=int, default=10, help='Jobs claimed at a time')
+        parser.add_argument('--sleep', type=float, default=1.0, help='Seconds to wait when no job is due')
+        parser.add_argument('--drain', action='store_true', help='Exit once no job is due instead of polling')
+        parser.add_argument('--purge-days', type=int, default=7, help='Delete finished jobs older than this many days')
+
+    def handle(self, *args, **options):
+        worker = f'{socket.gethostname()}-{os.getpid()}'
+        purged, _ = Job.objects.filter(
+            status='done', updated_at__lte=timezone.now() - timedelta(days=options['purge_days'])
+        ).delete()
+        self.stdout.write(f'Worker {worker} started, purged {purged} finished jobs')
+
+        try:
+            while True:
+                # a long running process has to drop connections the database closed
+                close_old_connections()
+                jobs = claim_jobs(worker, options['batch'])
+                for job in jobs:
+                    if run_job(job):
+                        self.stdout.write(self.style.SUCCESS(f'Done {job.name} #{job.pk}'))
+                    else:
+                        self.stdout.write(self.style.ERROR(f'Failed {job.name} #{job.pk} (attempt {job.attempts}/{job.max_attempts})'))
+
+                if not jobs:
+                    if options['drain']:
+                        break
+                    time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(f'Worker {worker} stopped')
@@ -0,0 +1,168 @@
+import random
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import DateTimeField, ExpressionWrapper, OuterRef, Subquery, Value
+from django.db.models.functions import Least
+from django.utils import timezone
+
+from api.models import Movie, Theater, Seat, Show, ShowSeat, Ticket, TicketSeat, Review
+
+
+# seeded rows are named with this prefix so they can be told apart and removed
+PREFIX = 'bench'
+GENRES = ['Action', 'Comedy', 'Drama', 'Horror', 'Sci-Fi', 'Animation', 'Thriller', 'Romance']
+
+
+def row_label(index):
+    """Row labels A..Z, then AA, AB, ... for large auditoriums."""
+    if index < 26:
+        return chr(ord('A') + index)
+    return chr(ord('A') + index // 26 - 1) + chr(ord('A') + index % 26)
+
+
+class Command(BaseCommand):
+    help = 'Seed realistic volumes of benchmark data (movies, theaters, seats, shows, tickets, reviews)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--movies', type=int, default=200)
+        parser.add_argument('--theaters', type=int, default=20)
+        parser.add_argument('--seats', type=int, default=300, help='Seats per theater')
+        parser.add_argument('--shows', type=int, default=60, help='Shows per theater')
+        parser.add_argument('--users', type=int, default=2000)
+        parser.add_argument('--occupancy', type=float, default=0.4, help='Share of seats booked per show')
+        parser.add_argument('--reviews', type=int, default=20000)
+        parser.add_argument('--seed', type=int, default=1, help='Random seed, for repeatable data')
+        parser.add_argument('--flush', action='store_true', help='Only remove previously seeded data')
+
+    def handle(self, *args, **options):
+        self.flush()
+        if options['flush']:
+            self.stdout.write(self.style.SUCCESS('Removed benchmark data'))
+            return
+
+        random.seed(options['seed'])
+        with transaction.atomic():
+            self.seed(options)
+
+    def flush(self):
+        # cascades remove shows, seats, tickets and reviews
+        Movie.objects.filter(title__startswith=f'{PREFIX} ').delete()
+        Theater.objects.filter(name__startswith=f'{PREFIX} ').delete()
+        User.objects.filter(username__startswith=f'{PREFIX}-').delete()
+
+    def seed(self, options):
+        now = timezone.now()
+
+        movies = Movie.objects.bulk_create([
+            Movie(
+                title=f'{PREFIX} movie {n}',
+                synopsis=f'Synopsis of benchmark movie {n}',
+                cast=[f'Actor {random.randint(1, 500)}' for _ in range(4)],
+                genre=random.choice(GENRES),
+                runtime_minutes=random.randint(80, 180),
+                release_date=(now - timedelta(days=random.randint(-60, 365))).date(),
+                poster_url='https://example.com/poster.jpg',
+                is_current=random.random() < 0.6,
+            )
+            for n in range(options['movies'])
+        ])
+
+        theaters = Theater.objects.bulk_create([
+            Theater(name=f'{PREFIX} theater {n}', address=f'{n} Benchmark Street', total_seats=options['seats'])
+            for n in range(options['theaters'])
+        ])
+        Seat.objects.bulk_create([
+            Seat(
+                theater=theater,
+                seat_number=f'{row_label(n // 20)}{n % 20 + 1}',
+                seat_type='VIP' if n // 20 in (5, 6) else 'regular',
+            )
+            for theater in theaters
+            for n in range(options['seats'])
+        ], batch_size=5000)
+
+        # shows spread over the last 30 days and the next 14
+        shows = Show.objects.bulk_create([
+            Show(
+                movie=random.choice(movies),
+                theater=theater,
+                showtime=now + timedelta(hours=random.randint(-30 * 24, 14 * 24)),
+                price=random.choice([9, 12, 15]),
+                is_active=random.random() < 0.95,
+            )
+            for theater in theaters
+            for _ in range(options['shows'])
+        ])
+        ShowSeat.create_for_shows(shows)
+
+        password = make_password(None)
+        User.objects.bulk_create([
+            User(username=f'{PREFIX}-user-{n}', email=f'{PREFIX}-user-{n}@example.com', password=password)
+            for n in range(options['users'])
+        ], batch_size=5000)
+        users = list(User.objects.filter(username__startswith=f'{PREFIX}-'))
+
+        self.book(shows, users, options['occupancy'], now)
+
+        Review.objects.bulk_create([
+            Review(
+                user=random.choice(users),
+                movie=random.choice(movies),
+                rating=random.randint(1, 5),
+                comment='Benchmark review',
+            )
+            for _ in range(options['reviews'])
+        ], batch_size=5000)
+        Movie.rebuild_review_aggregates(Movie.objects.filter(title__startswith=f'{PREFIX} '))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {len(movies)} movies, {len(theaters)} theaters, {len(shows)} shows, '
+            f'{ShowSeat.objects.filter(show__in=shows).count()} show seats, '
+            f'{Ticket.objects.filter(show__in=shows).count()} tickets, {options["reviews"]} reviews'
+        ))
+
+    def book(self, shows, users, occupancy, now):
+        """Book a share of every show's seats in tickets of 1-4 seats."""
+        seats_by_show = {}
+        for showseat_id, show_id, seat_id in ShowSeat.objects.filter(show__in=shows).values_list('id', 'show_id', 'seat_id'):
+            seats_by_show.setdefault(show_id, []).append((showseat_id, seat_id))
+
+        tickets = []
+        ticket_seats = []
+        booked_ids = []
+        for show in shows:
+            seats = seats_by_show.get(show.id, [])
+            random.shuffle(seats)
+            seats = seats[:int(len(seats) * occupancy)]
+            while seats:
+                size = random.randint(1, 4)
+                group, seats = seats[:size], seats[size:]
+                ticket = Ticket(
+                    id=uuid.uuid4(),
+                    user=random.choice(users),
+                    show=show,
+                    total_price=show.price * len(group),
+                )
+                ticket.ticket_qr = f'MBS-TICKET-{ticket.id}-USER-{ticket.user_id}'
+                tickets.append(ticket)
+                ticket_seats.extend(TicketSeat(ticket=ticket, seat_id=seat_id) for _, seat_id in group)
+                booked_ids.extend(showseat_id for showseat_id, _ in group)
+
+        Ticket.objects.bulk_create(tickets, batch_size=5000)
+        TicketSeat.objects.bulk_create(ticket_seats, batch_size=5000)
+        for start in range(0, len(booked_ids), 5000):
+            ShowSeat.objects.filter(id__in=booked_ids[start:start + 5000]).update(is_booked=True)
+
+        # booking_time is set on insert, move it to two days before the show (or now for future shows)
+        showtime = Subquery(Show.objects.filter(pk=OuterRef('show_id')).values('showtime')[:1])
+        Ticket.objects.filter(show__in=shows).update(
+            booking_time=Least(
+                ExpressionWrapper(showtime - timedelta(days=2), output_field=DateTimeField()),
+                Value(now, output_field=DateTimeField())
+            )
+        )
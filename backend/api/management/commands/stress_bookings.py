@@ -0,0 +1,124 @@
+import random
+import threading
+from collections import Counter
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count, Sum
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.models import Movie, Theater, Seat, Show, ShowSeat, Ticket, TicketSeat
+
+
+class Command(BaseCommand):
+    help = (
+        'Hammer booking and cancelling on one show from parallel threads, then check that '
+        'no seat is double booked, no booked seat is orphaned and no ticket is refunded twice. '
+        'Run it against PostgreSQL, SQLite serializes writers and reports "database is locked".'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seats', type=int, default=40, help='Seats in the show, few seats mean more conflicts')
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--rounds', type=int, default=50, help='Operations per thread')
+
+    def handle(self, *args, **options):
+        movie = Movie.objects.create(
+            title='Stress Movie', synopsis='', genre='Benchmark', runtime_minutes=120,
+            release_date=timezone.now().date(), poster_url='https://example.com/poster.jpg'
+        )
+        theater = Theater.objects.create(name='Stress Theater', address='')
+        Seat.objects.bulk_create([Seat(theater=theater, seat_number=f'S{n}') for n in range(1, options['seats'] + 1)])
+        show = Show.objects.create(movie=movie, theater=theater, showtime=timezone.now() + timedelta(days=7), price=10)
+        ShowSeat.create_for_shows([show])
+        showseat_ids = list(show.show_seats.values_list('id', flat=True))
+        user, _ = User.objects.get_or_create(username='stress-user')
+
+        results = Counter()
+        refunds = Counter()  # successful cancel responses per ticket
+        lock = threading.Lock()
+        problems = []
+
+        def worker():
+            client = APIClient()
+            client.force_authenticate(user)
+            try:
+                for _ in range(options['rounds']):
+                    try:
+                        paid = list(Ticket.objects.filter(show=show, status='paid').values_list('id', flat=True)[:5])
+                        if paid and random.random() < 0.5:
+                            # several threads often pick the same ticket, only one may win
+                            ticket_id = random.choice(paid)
+                            response = client.post(f'/api/tickets/{ticket_id}/cancel_ticket/', {}, format='json')
+                            outcome = 'cancelled' if response.status_code == 200 else 'cancel rejected'
+                            if response.status_code == 200:
+                                with lock:
+                                    refunds[ticket_id] += 1
+                        else:
+                            seats = random.sample(showseat_ids, random.randint(1, 3))
+                            response = client.post('/api/tickets/', {'show': str(show.id), 'seat_ids': seats}, format='json')
+                            outcome = 'booked' if response.status_code == 201 else 'booking rejected'
+                    except Exception as e:
+                        outcome = f'error: {type(e).__name__}'
+                    with lock:
+                        results[outcome] += 1
+            finally:
+                connection.close()
+
+        try:
+            threads = [threading.Thread(target=worker) for _ in range(options['threads'])]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            for outcome, count in sorted(results.items()):
+                self.stdout.write(f'{outcome}: {count}')
+
+            problems = self.check_invariants(show, refunds)
+            for problem in problems:
+                self.stdout.write(self.style.ERROR(problem))
+        finally:
+            # removes the show, seats and tickets through cascades
+            theater.delete()
+            movie.delete()
+            user.delete()
+
+        if problems:
+            raise CommandError(f'{len(problems)} invariants broken')
+        self.stdout.write(self.style.SUCCESS('All invariants hold'))
+
+    def check_invariants(self, show, refunds):
+        problems = []
+
+        # every seat is held by at most one paid ticket
+        double = (
+            TicketSeat.objects.filter(ticket__show=show, ticket__status='paid')
+            .values('seat_id').annotate(n=Count('id')).filter(n__gt=1)
+        )
+        if double:
+            problems.append(f'{len(double)} seats are in more than one paid ticket')
+
+        # a seat is booked exactly when a paid ticket has it
+        paid_seats = set(TicketSeat.objects.filter(ticket__show=show, ticket__status='paid').values_list('seat_id', flat=True))
+        booked_seats = set(ShowSeat.objects.filter(show=show, is_booked=True).values_list('seat_id', flat=True))
+        if booked_seats - paid_seats:
+            problems.append(f'{len(booked_seats - paid_seats)} seats are booked without a paid ticket')
+        if paid_seats - booked_seats:
+            problems.append(f'{len(paid_seats - booked_seats)} seats of paid tickets are not booked')
+
+        # each cancelled ticket was refunded by exactly one request
+        twice = [ticket_id for ticket_id, n in refunds.items() if n > 1]
+        if twice:
+            problems.append(f'{len(twice)} tickets were cancelled (and refunded) more than once')
+        cancelled = Ticket.objects.filter(show=show, status='cancelled')
+        if cancelled.count() != len(refunds):
+            problems.append(f'{cancelled.count()} tickets are cancelled but {len(refunds)} cancels succeeded')
+        totals = cancelled.aggregate(refunded=Sum('refund_amount'), paid=Sum('total_price'))
+        if (totals['refunded'] or 0) > (totals['paid'] or 0):
+            problems.append('More was refunded than was paid for the cancelled tickets')
+
+        return problems
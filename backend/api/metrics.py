@@ -0,0 +1,215 @@
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.db import connection
+from rest_framework.renderers import JSONRenderer
+
+
+class RequestMetrics:
+    """What one request spent: queries, DB time, serialization and rendering time, response size."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.render_seconds = 0.0
+        self.serialize_depth = 0
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        # installed with connection.execute_wrapper, runs around every query
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - start
+            self.queries += 1
+            self.statements.append(sql)
+
+
+_current = ContextVar("request_metrics", default=None)
+
+
+@contextmanager
+def serialization_timer():
+    """Time serializer work for the current request. Nested serializers count towards the outermost one."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+
+    metrics.serialize_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serialize_depth -= 1
+        if metrics.serialize_depth == 0:
+            metrics.serialize_seconds += time.perf_counter() - start
+
+
+@contextmanager
+def render_timer():
+    """Time rendering a response body for the current request."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.render_seconds += time.perf_counter() - start
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """JSONRenderer that records how long rendering took for the request metrics."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with render_timer():
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class MetricsRegistry:
+    """Totals per view action, kept in memory for this process and exported as Prometheus text."""
+
+    FIELDS = ("requests", "queries", "db_seconds", "serialize_seconds", "render_seconds", "seconds", "response_bytes")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.totals = defaultdict(lambda: dict.fromkeys(self.FIELDS, 0))
+        self.max_queries = defaultdict(int)
+
+    def record(self, view, method, status, metrics, seconds, response_bytes):
+        with self.lock:
+            row = self.totals[(view, method, status)]
+            row["requests"] += 1
+            row["queries"] += metrics.queries
+            row["db_seconds"] += metrics.db_seconds
+            row["serialize_seconds"] += metrics.serialize_seconds
+            row["render_seconds"] += metrics.render_seconds
+            row["seconds"] += seconds
+            row["response_bytes"] += response_bytes
+            self.max_queries[view] = max(self.max_queries[view], metrics.queries)
+
+    def reset(self):
+        with self.lock:
+            self.totals.clear()
+            self.max_queries.clear()
+
+    def prometheus(self):
+        counters = [
+            ("requests", "mbs_requests_total", "Requests handled"),
+            ("queries", "mbs_db_queries_total", "SQL queries run"),
+            ("db_seconds", "mbs_db_seconds_total", "Time spent in SQL queries"),
+            ("serialize_seconds", "mbs_serialize_seconds_total", "Time spent in serializers (including queries they make)"),
+            ("render_seconds", "mbs_render_seconds_total", "Time spent rendering response bodies"),
+            ("seconds", "mbs_request_seconds_total", "Time spent handling requests"),
+            ("response_bytes", "mbs_response_bytes_total", "Response body bytes sent"),
+        ]
+        with self.lock:
+            totals = {key: dict(row) for key, row in self.totals.items()}
+            max_queries = dict(self.max_queries)
+
+        lines = []
+        for field, name, description in counters:
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} counter")
+            for (view, method, status), row in sorted(totals.items()):
+                lines.append(f'{name}{{view="{view}",method="{method}",status="{status}"}} {row[field]}')
+
+        lines.append("# HELP mbs_db_queries_max Most SQL queries one request of a view has run")
+        lines.append("# TYPE mbs_db_queries_max gauge")
+        for view, count in sorted(max_queries.items()):
+            lines.append(f'mbs_db_queries_max{{view="{view}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def view_name(request):
+    """ViewSet.action (or View.method) of the view that handled the request."""
+    match = request.resolver_match
+    func = match.func if match else None
+    cls = getattr(func, "cls", None) or getattr(func, "view_class", None)
+    if cls is None:
+        return match.view_name if match else "unmatched"
+
+    actions = getattr(func, "actions", None) or {}
+    return f"{cls.__name__}.{actions.get(request.method.lower(), request.method.lower())}"
+
+
+class RequestMetricsMiddleware:
+    """
+    Measure every request: query count and DB time (through a database execute wrapper),
+    serialization and render time (see serialization_timer and TimedJSONRenderer),
+    total time and response bytes. Sent back in a Server-Timing header and added
+    to the registry served at /api/metrics/.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            with connection.execute_wrapper(metrics):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        # Under ASGI sync views and the async ORM run their queries on the request's
+        # worker thread, so the wrapper goes on that thread's connection
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        await sync_to_async(lambda: connection.execute_wrappers.append(metrics))()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(lambda: connection.execute_wrappers.remove(metrics))()
+            _current.reset(token)
+        return self.finish(request, response, metrics, time.perf_counter() - start)
+
+    def finish(self, request, response, metrics, seconds):
+        response_bytes = 0 if response.streaming else len(response.content)
+        response["Server-Timing"] = ", ".join([
+            f'db;dur={metrics.db_seconds * 1000:.1f};desc="{metrics.queries} queries"',
+            f"serialize;dur={metrics.serialize_seconds * 1000:.1f}",
+            f"render;dur={metrics.render_seconds * 1000:.1f}",
+            f"total;dur={seconds * 1000:.1f}",
+        ])
+        registry.record(view_name(request), request.method, response.status_code, metrics, seconds, response_bytes)
+        return response
+
+
+@contextmanager
+def query_budget(max_queries):
+    """
+    Fail with an AssertionError listing the SQL when the block runs more than
+    `max_queries` queries, e.g.
+
+        with query_budget(4):
+            client.get("/api/tickets/")
+    """
+    metrics = RequestMetrics()
+    with connection.execute_wrapper(metrics):
+        yield metrics
+    if metrics.queries > max_queries:
+        statements = "\n".join(f"  {n}. {sql}" for n, sql in enumerate(metrics.statements, 1))
+        raise AssertionError(f"{metrics.queries} queries run, the budget is {max_queries}:\n{statements}")
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_userprofile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='show',
+            name='seat_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
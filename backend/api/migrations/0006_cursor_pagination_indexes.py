@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_seathold'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='movie',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='show',
+            name='showtime',
+            field=models.DateTimeField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='theater',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='ticket',
+            name='booking_time',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:05
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce, NullIf
+
+
+def fill_review_aggregates(apps, schema_editor):
+    Movie = apps.get_model('api', 'Movie')
+    Review = apps.get_model('api', 'Review')
+
+    reviews = Review.objects.filter(movie=models.OuterRef('pk')).order_by().values('movie')
+    Movie.objects.update(
+        review_count=Coalesce(models.Subquery(reviews.annotate(n=models.Count('id')).values('n')), 0),
+        rating_sum=Coalesce(models.Subquery(reviews.annotate(total=models.Sum('rating')).values('total')), 0.0),
+    )
+    Movie.objects.update(
+        average_rating=Coalesce(models.F('rating_sum') / NullIf(models.F('review_count'), 0), 0.0, output_field=models.FloatField())
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_cursor_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movie',
+            name='average_rating',
+            field=models.FloatField(db_index=True, default=0.0),
+        ),
+        migrations.AddField(
+            model_name='movie',
+            name='rating_sum',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='movie',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_review_aggregates, migrations.RunPython.noop),
+    ]
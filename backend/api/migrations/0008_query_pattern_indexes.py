@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_movie_review_aggregates'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['is_current', '-created_at'], name='movie_current_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['genre'], name='movie_genre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['movie', '-created_at'], name='review_movie_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='show',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['movie', 'showtime'], name='show_active_movie_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='show',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['theater', 'showtime'], name='show_active_theater_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='showseat',
+            index=models.Index(condition=models.Q(('is_booked', False)), fields=['show'], name='showseat_free_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='showseat',
+            index=models.Index(condition=models.Q(('held_until__isnull', False)), fields=['held_until'], name='showseat_held_until_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['user', '-booking_time'], name='ticket_user_booking_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['show', 'status'], name='ticket_show_status_idx'),
+        ),
+    ]
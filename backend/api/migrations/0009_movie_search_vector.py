@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:35
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# The search vector is kept up to date by a trigger, so bulk_create and update()
+# are covered too. Title words weigh most, then genre and cast, then the synopsis.
+CREATE_SEARCH = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE OR REPLACE FUNCTION api_movie_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.genre, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW."cast"::text, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.synopsis, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER api_movie_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, genre, "cast", synopsis ON api_movie
+    FOR EACH ROW EXECUTE FUNCTION api_movie_search_vector_update();
+
+UPDATE api_movie SET title = title;
+
+CREATE INDEX movie_search_vector_idx ON api_movie USING gin (search_vector);
+CREATE INDEX movie_title_trgm_idx ON api_movie USING gin (title gin_trgm_ops);
+"""
+
+DROP_SEARCH = """
+DROP INDEX IF EXISTS movie_title_trgm_idx;
+DROP INDEX IF EXISTS movie_search_vector_idx;
+DROP TRIGGER IF EXISTS api_movie_search_vector_trigger ON api_movie;
+DROP FUNCTION IF EXISTS api_movie_search_vector_update();
+"""
+
+
+def create_search(apps, schema_editor):
+    # other databases search with the in-process index in api/search.py
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_SEARCH)
+
+
+def drop_search(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_SEARCH)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_query_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movie',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search, drop_search),
+    ]
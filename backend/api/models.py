@@ -1,7 +1,13 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Coalesce, NullIf
+from django.utils import timezone
 from django.contrib.auth.models import User
 import uuid
 
+from .cache import bump_version
+
 
 # extending the User 
 class UserProfile(models.Model):
@@ -23,6 +29,32 @@ CANCELLATION_POLICY = {
     'min_hours_before_show': 1  # 1 hour before show to cancel
 }
 
+def refund_percentage(hours_until_show):
+    """Percent of the price refunded for a cancellation this many hours before the show."""
+    if hours_until_show >= 24:
+        return CANCELLATION_POLICY['hours_24_plus']
+    if hours_until_show >= 6:
+        return CANCELLATION_POLICY['hours_6_24']
+    if hours_until_show >= CANCELLATION_POLICY['min_hours_before_show']:
+        return CANCELLATION_POLICY['hours_1_6']
+    return 0  # too late to cancel under the policy
+
+# how long selected seats stay reserved for a user while they pay
+SEAT_HOLD_MINUTES = 10
+# most seats one booking or seat hold can take
+MAX_SEATS_PER_BOOKING = 10
+
+
+def free_seat_q(prefix=""):
+    """
+    Q for seats that can be booked: not booked and not under an unexpired hold.
+    Expired holds count as free right away, so they never need to be cleaned up
+    before a read. Use prefix to filter through a relation, e.g. "show_seats__".
+    """
+    return Q(**{f"{prefix}is_booked": False}) & (
+        Q(**{f"{prefix}held_until__isnull": True}) | Q(**{f"{prefix}held_until__lte": timezone.now()})
+    )
+
 class Movie(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     title = models.CharField(max_length=255)
@@ -32,27 +64,76 @@ class Movie(models.Model):
     runtime_minutes = models.IntegerField()
     release_date = models.DateField()
     rating = models.FloatField(default=0.0)
+    # review aggregates, kept up to date on every review write (see apply_review_change and api/signals.py)
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.FloatField(default=0.0)
+    average_rating = models.FloatField(default=0.0, db_index=True)
     poster_url = models.URLField()
     trailer_url = models.URLField(blank=True, null=True)
     is_current = models.BooleanField(default=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)  # cursor pagination key
     updated_at = models.DateTimeField(auto_now=True)
+    # title, genre, cast and synopsis for full-text search, filled by a trigger on PostgreSQL (see api/search.py)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # catalog: current/upcoming movies, newest first
+            models.Index(fields=["is_current", "-created_at"], name="movie_current_created_idx"),
+            models.Index(fields=["genre"], name="movie_genre_idx"),
+        ]
 
     def __str__(self):
         return self.title 
 
+    @classmethod
+    def apply_review_change(cls, movie_id, count_delta, rating_delta):
+        """
+        Adjust the review aggregates of a movie in one UPDATE with F-expressions,
+        so concurrent review writes never overwrite each other's changes.
+        """
+        new_count = models.F("review_count") + count_delta
+        new_sum = models.F("rating_sum") + rating_delta
+        cls.objects.filter(pk=movie_id).update(
+            review_count=new_count,
+            rating_sum=new_sum,
+            average_rating=Coalesce(new_sum / NullIf(new_count, 0), 0.0, output_field=models.FloatField()),
+        )
+        # update() sends no signals, the cached catalog has to be told directly
+        bump_version("movies")
+
+    @classmethod
+    def rebuild_review_aggregates(cls, queryset=None):
+        """Recompute the review aggregates of all movies (or a queryset of them) from the reviews table."""
+        queryset = cls.objects.all() if queryset is None else queryset
+        reviews = Review.objects.filter(movie=models.OuterRef("pk")).order_by().values("movie")
+        queryset.update(
+            review_count=Coalesce(models.Subquery(reviews.annotate(n=models.Count("id")).values("n")), 0),
+            rating_sum=Coalesce(models.Subquery(reviews.annotate(total=models.Sum("rating")).values("total")), 0.0),
+        )
+        updated = queryset.update(
+            average_rating=Coalesce(models.F("rating_sum") / NullIf(models.F("review_count"), 0), 0.0, output_field=models.FloatField())
+        )
+        bump_version("movies")
+        return updated
+
 
 class Theater(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=255)
     address = models.TextField()
     total_seats = models.PositiveIntegerField(default=0)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)  # cursor pagination key
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def update_total_seats(cls, theater_id):
+        """Set total_seats from the seats the theater actually has."""
+        cls.objects.filter(pk=theater_id).update(total_seats=Seat.objects.filter(theater_id=theater_id).count())
+
 
 class Seat(models.Model):
     theater = models.ForeignKey(Theater, on_delete=models.CASCADE, related_name="seats")
@@ -70,28 +151,80 @@ class Show(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name="shows")
     theater = models.ForeignKey(Theater, on_delete=models.CASCADE, related_name="shows")
-    showtime = models.DateTimeField()
+    showtime = models.DateTimeField(db_index=True)  # cursor pagination key
     price = models.DecimalField(max_digits=6, decimal_places=2)
     is_active = models.BooleanField(default=True)   # soft delete for shows
+    seat_version = models.PositiveIntegerField(default=0)  # bumped on every seat change, used for seat map ETags
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # booking page: active shows of a movie (optionally in a theater) by time
+            models.Index(fields=["movie", "showtime"], condition=Q(is_active=True), name="show_active_movie_time_idx"),
+            models.Index(fields=["theater", "showtime"], condition=Q(is_active=True), name="show_active_theater_time_idx"),
+        ]
+
     def __str__(self):
         return f"{self.movie.title} @ {self.theater.name} ({self.showtime})"
 
+    @classmethod
+    def bump_seat_version(cls, *show_ids):
+        """Mark the seats of the given shows as changed so cached seat maps are refreshed."""
+        cls.objects.filter(pk__in=show_ids).update(seat_version=models.F("seat_version") + 1)
+
+
+
+class SeatHold(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)  # the hold token
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="seat_holds")
+    show = models.ForeignKey(Show, on_delete=models.CASCADE, related_name="seat_holds")
+    expires_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Hold {self.id} - {self.user.username} (until {self.expires_at})"
 
 
 class ShowSeat(models.Model):
     show = models.ForeignKey(Show, on_delete=models.CASCADE, related_name="show_seats")
     seat = models.ForeignKey(Seat, on_delete=models.CASCADE)
     is_booked = models.BooleanField(default=False)
+    hold = models.ForeignKey(SeatHold, on_delete=models.SET_NULL, null=True, blank=True, related_name="show_seats")
+    held_until = models.DateTimeField(null=True, blank=True)  # copy of hold.expires_at so availability needs no join
 
     class Meta:
         unique_together = ("show", "seat")
+        indexes = [
+            # free seats of a show, booked seats drop out of the index
+            models.Index(fields=["show"], condition=Q(is_booked=False), name="showseat_free_idx"),
+            # release_expired_holds, only held seats are in the index
+            models.Index(fields=["held_until"], condition=Q(held_until__isnull=False), name="showseat_held_until_idx"),
+        ]
 
     def __str__(self):
         return f"{self.show} - {self.seat.seat_number} ({'Booked' if self.is_booked else 'Available'})"
 
+    @classmethod
+    def create_for_shows(cls, shows):
+        """
+        Create a ShowSeat for every seat in each show's theater with one bulk insert.
+        Seats the show already has are skipped, so this can also fill in missing seats.
+        """
+        seat_ids = {}
+        show_seats = []
+        for show in shows:
+            if show.theater_id not in seat_ids:
+                seat_ids[show.theater_id] = list(
+                    Seat.objects.filter(theater_id=show.theater_id).values_list("id", flat=True)
+                )
+            show_seats.extend(cls(show=show, seat_id=seat_id) for seat_id in seat_ids[show.theater_id])
+
+        cls.objects.bulk_create(show_seats, batch_size=2000, ignore_conflicts=True)
+        Show.bump_seat_version(*[show.id for show in shows])
+        # bulk-created shows send no signals, and the schedule counts the new seats
+        bump_version("schedule")
+
 
 class Ticket(models.Model):
     STATUS_CHOICES = [
@@ -105,7 +238,7 @@ class Ticket(models.Model):
     show = models.ForeignKey(Show, on_delete=models.CASCADE, related_name="tickets")
     total_price = models.DecimalField(max_digits=8, decimal_places=2)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='paid')
-    booking_time = models.DateTimeField(auto_now_add=True)
+    booking_time = models.DateTimeField(auto_now_add=True, db_index=True)  # cursor pagination key
     ticket_qr = models.TextField(blank=True)  # QR code string data
     cancelled_at = models.DateTimeField(null=True, blank=True)  # When ticket was cancelled
     cancellation_reason = models.CharField(max_length=255, blank=True)  # Reason for cancellation
@@ -113,6 +246,13 @@ class Ticket(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # order history: a user's tickets, newest first
+            models.Index(fields=["user", "-booking_time"], name="ticket_user_booking_idx"),
+            models.Index(fields=["show", "status"], name="ticket_show_status_idx"),
+        ]
+
     def __str__(self):
         return f"Ticket {self.id} - {self.show.movie.title}"
 
@@ -144,7 +284,44 @@ class Review(models.Model):
     movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name="reviews")
     rating = models.FloatField()
     comment = models.TextField(blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)  # cursor pagination key
+
+    class Meta:
+        indexes = [
+            # reviews of a movie, newest first
+            models.Index(fields=["movie", "-created_at"], name="review_movie_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.movie.title} - {self.rating}/5"
+
+
+class Job(models.Model):
+    """A piece of background work, queued in the database and run by the run_jobs worker (see api/jobs.py)."""
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed')
+    ]
+
+    name = models.CharField(max_length=100)  # name of a registered task
+    payload = models.JSONField(default=dict)  # keyword arguments of the task
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)  # not run before this, moved on for retries
+    locked_by = models.CharField(max_length=100, blank=True)  # worker running it
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # workers: jobs that are due, oldest first
+            models.Index(fields=["status", "run_after"], name="job_status_run_after_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
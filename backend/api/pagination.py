@@ -0,0 +1,118 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination, _reverse_ordering
+from rest_framework.response import Response
+
+
+class LinkHeaderMixin:
+    """
+    Keep the body a plain list like an unpaginated response and send the
+    next/previous page URLs in a Link header: <url>; rel="next", <url>; rel="prev".
+    """
+
+    def get_paginated_response(self, data):
+        links = []
+        next_url = self.get_next_link()
+        previous_url = self.get_previous_link()
+        if next_url:
+            links.append(f'<{next_url}>; rel="next"')
+        if previous_url:
+            links.append(f'<{previous_url}>; rel="prev"')
+
+        headers = {"Link": ", ".join(links)} if links else {}
+        return Response(data, headers=headers)
+
+
+class KeysetCursorPagination(LinkHeaderMixin, CursorPagination):
+    """
+    Keyset pagination on an indexed column, so deep pages cost the same as the first.
+
+    Views pick the column with `cursor_ordering` (defaults to newest first by created_at).
+    Every list is paginated, ?page_size= asks for up to max_page_size rows a page.
+    """
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    ordering = "-created_at"
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, "cursor_ordering", self.ordering)
+        if isinstance(ordering, str):
+            return (ordering,)
+        return tuple(ordering)
+
+    # CursorPagination.paginate_queryset, split around the one query it runs so the
+    # async views (api/async_views.py) can run it with the async ORM
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_query = self.page_query(queryset, request, view)
+        if page_query is None:
+            return None
+        return self.set_page(list(page_query))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        page_query = self.page_query(queryset, request, view)
+        if page_query is None:
+            return None
+        return self.set_page([row async for row in page_query])
+
+    def page_query(self, queryset, request, view):
+        """The rows of the requested page and one more, None without pagination."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        offset, reverse, current_position = self.cursor or (0, False, None)
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        # continue after the cursor's position
+        if current_position is not None:
+            order = self.ordering[0]
+            if self.cursor.reverse != order.startswith("-"):
+                queryset = queryset.filter(**{order.lstrip("-") + "__lt": current_position})
+            else:
+                queryset = queryset.filter(**{order.lstrip("-") + "__gt": current_position})
+
+        return queryset[offset:offset + self.page_size + 1]
+
+    def set_page(self, results):
+        offset, reverse, current_position = self.cursor or (0, False, None)
+        self.page = results[:self.page_size]
+
+        # the extra row tells whether there is a page after this one
+        if len(results) > len(self.page):
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            following_position = None
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = current_position is not None or offset > 0
+            self.has_previous = following_position is not None
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = following_position is not None
+            self.has_previous = current_position is not None or offset > 0
+            self.next_position = following_position
+            self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+
+class RankedPagination(LinkHeaderMixin, PageNumberPagination):
+    """
+    Page numbers for results ordered by a computed rank (search), which a cursor
+    can't follow. Only the first few pages of a search are ever read.
+    """
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
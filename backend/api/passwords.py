@@ -0,0 +1,79 @@
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.http import JsonResponse
+from django.utils.deprecation import MiddlewareMixin
+
+
+class HashingPoolFull(Exception):
+    """No place on the HashingPool within PASSWORD_HASHING_WAIT_SECONDS."""
+
+
+class HashingPool:
+    """
+    A few threads that do all the password hashing of the process. Sign-ups, logins and
+    password changes wait for their hash here, so however many of them come in at once
+    they use at most `workers` CPUs and leave the rest to the other requests.
+    """
+
+    def __init__(self, workers, queue, wait_seconds):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hashing")
+        # hashes running or waiting for a worker, past that callers wait for a slot
+        self.slots = threading.BoundedSemaphore(workers + queue)
+        self.wait_seconds = wait_seconds
+
+    def run(self, func, *args):
+        if not self.slots.acquire(timeout=self.wait_seconds):
+            raise HashingPoolFull(f"{self.slots._initial_value} password hashes already running or queued")
+        try:
+            return self.executor.submit(func, *args).result()
+        finally:
+            self.slots.release()
+
+    def shutdown(self):
+        self.executor.shutdown()
+
+
+@cache
+def get_hashing_pool():
+    """The process's HashingPool, None with PASSWORD_HASHING_WORKERS = 0 (hash in the caller's thread)."""
+    if not settings.PASSWORD_HASHING_WORKERS:
+        return None
+    return HashingPool(
+        settings.PASSWORD_HASHING_WORKERS,
+        settings.PASSWORD_HASHING_QUEUE,
+        settings.PASSWORD_HASHING_WAIT_SECONDS,
+    )
+
+
+class PooledPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    Django's default hasher (same algorithm and hashes) running on the HashingPool.
+    encode is all that's costly, verify and harden_runtime go through it as well.
+    """
+
+    def encode(self, password, salt, iterations=None):
+        pool = get_hashing_pool()
+        if pool is None:
+            return super().encode(password, salt, iterations)
+        return pool.run(super().encode, password, salt, iterations)
+
+
+class HashingPoolFullMiddleware(MiddlewareMixin):
+    """
+    Answer a request whose password hash found the pool full (sign-up, login, password
+    change, the admin login) with a 429 and Retry-After instead of a server error.
+    """
+
+    def process_exception(self, request, exception):
+        if isinstance(exception, HashingPoolFull):
+            response = JsonResponse(
+                {"detail": "Too many sign-ins at the moment, please try again shortly."}, status=429
+            )
+            response["Retry-After"] = str(math.ceil(settings.PASSWORD_HASHING_WAIT_SECONDS))
+            return response
+        return None
@@ -20,4 +20,4 @@ class IsAdminOrReadOnly(BasePermission):
 # user is the foreign key attribute.
 class IsOrderOwner(BasePermission):
     def has_object_permission(self, request, view, obj):
-        return obj.user == request.user
\ No newline at end of file
+        return obj.user_id == request.user.id
\ No newline at end of file
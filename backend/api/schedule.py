@@ -0,0 +1,154 @@
+from datetime import date, datetime, time, timedelta
+
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .cache import aget_version, get_version
+from .models import Show, free_seat_q
+
+
+# A day of the schedule is reused this long. Show changes invalidate it at once
+# (see api/signals.py), remaining seat counts may lag by up to this much.
+SCHEDULE_CACHE_SECONDS = 30
+# longest date range one request can ask for
+MAX_SCHEDULE_DAYS = 14
+
+
+def _day_bounds(day):
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def schedule_range(params):
+    """
+    First and last day from ?from=YYYY-MM-DD (default today) and ?to= (default a week on),
+    a ValidationError when they aren't a valid range.
+    """
+    try:
+        first_day = date.fromisoformat(params.get("from") or timezone.localdate().isoformat())
+        last_day = date.fromisoformat(params["to"]) if params.get("to") else first_day + timedelta(days=6)
+    except ValueError:
+        raise ValidationError("from and to must be dates (YYYY-MM-DD)")
+    if last_day < first_day:
+        raise ValidationError("to must not be before from")
+    if (last_day - first_day).days >= MAX_SCHEDULE_DAYS:
+        raise ValidationError(f"The schedule covers at most {MAX_SCHEDULE_DAYS} days")
+    return first_day, last_day
+
+
+def _days_query(days):
+    """
+    The active shows of the given days with their movie, theater and remaining seats,
+    as plain rows from a single grouped query.
+    """
+    start, _ = _day_bounds(min(days))
+    _, end = _day_bounds(max(days))
+    return (
+        Show.objects.filter(is_active=True, showtime__gte=start, showtime__lt=end)
+        .values(
+            "id", "showtime", "price",
+            "movie_id", "movie__title", "movie__genre", "movie__runtime_minutes", "movie__poster_url",
+            "theater_id", "theater__name", "theater__address",
+        )
+        .annotate(available_seats=Count("show_seats", filter=free_seat_q("show_seats__")))
+        .order_by("showtime")
+    )
+
+
+def _by_day(rows, days):
+    by_day = {day: [] for day in days}
+    for row in rows:
+        day = timezone.localtime(row["showtime"]).date()
+        if day in by_day:
+            by_day[day].append(row)
+    return by_day
+
+
+def _day_keys(first_day, last_day, version):
+    days = [first_day + timedelta(days=n) for n in range((last_day - first_day).days + 1)]
+    return {day: f"schedule:{version}:{day.isoformat()}" for day in days}
+
+
+def schedule_rows(first_day, last_day):
+    """Show rows from first_day to last_day (inclusive), each day cached on its own."""
+    keys = _day_keys(first_day, last_day, get_version("schedule"))
+    cached = cache.get_many(keys.values())
+    by_day = {day: cached[key] for day, key in keys.items() if key in cached}
+
+    missing = [day for day in keys if day not in by_day]
+    if missing:
+        fetched = _by_day(_days_query(missing), missing)
+        cache.set_many({keys[day]: rows for day, rows in fetched.items()}, SCHEDULE_CACHE_SECONDS)
+        by_day.update(fetched)
+
+    return [row for day in keys for row in by_day[day]]
+
+
+async def aschedule_rows(first_day, last_day):
+    """schedule_rows with the async ORM and cache."""
+    keys = _day_keys(first_day, last_day, await aget_version("schedule"))
+    cached = await cache.aget_many(keys.values())
+    by_day = {day: cached[key] for day, key in keys.items() if key in cached}
+
+    missing = [day for day in keys if day not in by_day]
+    if missing:
+        fetched = _by_day([row async for row in _days_query(missing)], missing)
+        await cache.aset_many({keys[day]: rows for day, rows in fetched.items()}, SCHEDULE_CACHE_SECONDS)
+        by_day.update(fetched)
+
+    return [row for day in keys for row in by_day[day]]
+
+
+def build_schedule(first_day, last_day, movie_id=None, theater_id=None):
+    """
+    Upcoming shows between two dates, nested as movies -> theaters -> showtimes,
+    optionally for one movie and/or theater. Shows that already started are left out.
+    """
+    return _nest(schedule_rows(first_day, last_day), first_day, last_day, movie_id, theater_id)
+
+
+async def abuild_schedule(first_day, last_day, movie_id=None, theater_id=None):
+    return _nest(await aschedule_rows(first_day, last_day), first_day, last_day, movie_id, theater_id)
+
+
+def _nest(rows, first_day, last_day, movie_id, theater_id):
+    now = timezone.now()
+    movies = {}
+    for row in rows:
+        if row["showtime"] < now:
+            continue
+        if movie_id and str(row["movie_id"]) != str(movie_id):
+            continue
+        if theater_id and str(row["theater_id"]) != str(theater_id):
+            continue
+
+        movie = movies.setdefault(row["movie_id"], {
+            "id": row["movie_id"],
+            "title": row["movie__title"],
+            "genre": row["movie__genre"],
+            "runtime_minutes": row["movie__runtime_minutes"],
+            "poster_url": row["movie__poster_url"],
+            "theaters": {},
+        })
+        theater = movie["theaters"].setdefault(row["theater_id"], {
+            "id": row["theater_id"],
+            "name": row["theater__name"],
+            "address": row["theater__address"],
+            "shows": [],
+        })
+        theater["shows"].append({
+            "id": row["id"],
+            "showtime": row["showtime"],
+            "price": f"{row['price']:.2f}",
+            "available_seats": row["available_seats"],
+        })
+
+    for movie in movies.values():
+        movie["theaters"] = sorted(movie["theaters"].values(), key=lambda t: t["name"])
+    return {
+        "from": first_day,
+        "to": last_day,
+        "movies": sorted(movies.values(), key=lambda m: m["title"]),
+    }
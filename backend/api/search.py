@@ -0,0 +1,160 @@
+import math
+import re
+import threading
+from collections import defaultdict
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db import connection
+from django.db.models import Case, F, FloatField, Value, When
+
+from .cache import get_version
+from .models import Movie
+
+
+# text search configuration of the search_vector column (see migration 0009)
+SEARCH_CONFIG = "english"
+# minimum similarity of a misspelt word to a title word, same as pg_trgm's default
+TRIGRAM_THRESHOLD = 0.3
+# search results are ranked in Python on databases without full-text search, this caps them
+MAX_RESULTS = 1000
+
+# weight of a word by the field it was found in, like setweight A/B/C in PostgreSQL
+FIELD_WEIGHTS = {"title": 1.0, "genre": 0.4, "cast": 0.4, "synopsis": 0.2}
+
+WORD_RE = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return WORD_RE.findall(text.lower())
+
+
+def trigrams(word):
+    """Trigrams of a word padded like pg_trgm does ("  w", " wo", ..., "rd ")."""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(a, b):
+    return len(a & b) / len(a | b)
+
+
+class MovieSearchIndex:
+    """
+    In-process inverted index over the catalog, for databases without full-text search.
+
+    Each word maps to the movies it appears in with a score by field, and each trigram
+    to the words that contain it, to find close matches of misspelt words.
+    The index is rebuilt when the "movies" cache version moves (see api/cache.py).
+    """
+
+    def __init__(self):
+        self.version = None
+        self.movie_count = 0
+        self.postings = {}
+        self.words_by_trigram = {}
+        self.lock = threading.Lock()
+
+    def build(self):
+        postings = defaultdict(lambda: defaultdict(float))
+        movie_count = 0
+        for pk, title, synopsis, genre, cast in Movie.objects.values_list("pk", "title", "synopsis", "genre", "cast"):
+            fields = {
+                "title": title,
+                "synopsis": synopsis,
+                "genre": genre,
+                "cast": " ".join(str(name) for name in cast or []),
+            }
+            movie_count += 1
+            for field, text in fields.items():
+                for word in tokenize(text or ""):
+                    postings[word][pk] += FIELD_WEIGHTS[field]
+
+        words_by_trigram = defaultdict(set)
+        for word in postings:
+            for trigram in trigrams(word):
+                words_by_trigram[trigram].add(word)
+
+        self.movie_count = movie_count
+        self.postings = {word: dict(movies) for word, movies in postings.items()}
+        self.words_by_trigram = dict(words_by_trigram)
+
+    def refresh(self):
+        version = get_version("movies")
+        if version != self.version:
+            with self.lock:
+                if version != self.version:
+                    self.build()
+                    self.version = version
+
+    def close_words(self, word):
+        """Indexed words similar enough to a word that isn't in the index."""
+        word_trigrams = trigrams(word)
+        candidates = set()
+        for trigram in word_trigrams:
+            candidates |= self.words_by_trigram.get(trigram, set())
+        return [w for w in candidates if similarity(word_trigrams, trigrams(w)) >= TRIGRAM_THRESHOLD]
+
+    def search(self, text):
+        """Ids of the movies matching every word of the text, best match first."""
+        self.refresh()
+        postings = self.postings
+
+        scores = None
+        for word in set(tokenize(text)):
+            words = [word] if word in postings else self.close_words(word)
+            word_scores = defaultdict(float)
+            for match in words:
+                movies = postings[match]
+                idf = math.log(1 + self.movie_count / len(movies))
+                for pk, weight in movies.items():
+                    word_scores[pk] = max(word_scores[pk], weight * idf)
+
+            if scores is None:
+                scores = dict(word_scores)
+            else:
+                scores = {pk: score + word_scores[pk] for pk, score in scores.items() if pk in word_scores}
+            if not scores:
+                return []
+
+        if scores is None:
+            return []
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return [(pk, score) for pk, score in ranked[:MAX_RESULTS]]
+
+
+movie_index = MovieSearchIndex()
+
+
+def _postgres_search(queryset, text):
+    query = SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+    matches = queryset.filter(search_vector=query)
+    if matches.exists():
+        return matches.annotate(rank=SearchRank(F("search_vector"), query)).order_by("-rank", "-created_at")
+
+    # nothing matched as typed, look for titles with words close to the text (typos)
+    return (
+        queryset.filter(title__trigram_word_similar=text)
+        .annotate(rank=TrigramWordSimilarity(text, "title"))
+        .order_by("-rank", "-created_at")
+    )
+
+
+def _index_search(queryset, text):
+    ranked = movie_index.search(text)
+    if not ranked:
+        return queryset.none()
+    rank = Case(*[When(pk=pk, then=Value(score)) for pk, score in ranked], output_field=FloatField())
+    return queryset.filter(pk__in=[pk for pk, _ in ranked]).annotate(rank=rank).order_by("-rank", "-created_at")
+
+
+def search_movies(queryset, text):
+    """
+    Movies of the queryset matching a search over title, synopsis, genre and cast,
+    annotated with a `rank` and best match first.
+
+    PostgreSQL uses the maintained search_vector (GIN indexed) and falls back to
+    trigram similarity on the title for typos. Other databases use the in-process index.
+    """
+    if connection.vendor == "postgresql":
+        return _postgres_search(queryset, text)
+    return _index_search(queryset, text)
@@ -0,0 +1,107 @@
+import re
+
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from .models import Show, ShowSeat
+
+
+# splits a seat number like "A10" into its row ("A") and seat label ("10")
+SEAT_NUMBER_RE = re.compile(r"^([A-Za-z]*)(.*)$")
+
+
+def _seat_sort_key(seat_number):
+    row, label = SEAT_NUMBER_RE.match(seat_number).groups()
+    # numeric labels sort naturally (A2 before A10), anything else sorts after them
+    return (row, 0, int(label), "") if label.isdigit() else (row, 1, 0, label)
+
+
+def _runs(values):
+    """Run-length encode a list of booleans as alternating run lengths, starting with False."""
+    runs = []
+    current = False
+    length = 0
+    for value in values:
+        if value == current:
+            length += 1
+        else:
+            runs.append(length)
+            current = value
+            length = 1
+    runs.append(length)
+    return runs
+
+
+def _id_runs(ids):
+    """Encode ShowSeat ids as [first_id, count] runs of consecutive ids."""
+    runs = []
+    for seat_id in ids:
+        if runs and runs[-1][0] + runs[-1][1] == seat_id:
+            runs[-1][1] += 1
+        else:
+            runs.append([seat_id, 1])
+    return runs
+
+
+def seat_map_shows():
+    """
+    Shows with what the seat map's ETag needs: the seat version and the next hold
+    expiry, which changes availability without a write.
+    """
+    return Show.objects.only("id", "seat_version").annotate(
+        next_hold_expiry=Min("show_seats__held_until", filter=Q(show_seats__held_until__gt=timezone.now()))
+    )
+
+
+def seat_map_etag(show):
+    expiry = int(show.next_hold_expiry.timestamp()) if show.next_hold_expiry else 0
+    return f'"seatmap-{show.id}-{show.seat_version}-{expiry}"'
+
+
+def _seats_query(show):
+    return ShowSeat.objects.filter(show_id=show.id).values_list(
+        "id", "seat__seat_number", "seat__seat_type", "is_booked", "held_until"
+    )
+
+
+def build_seat_map(show):
+    return _seat_map(show, list(_seats_query(show)))
+
+
+async def abuild_seat_map(show):
+    return _seat_map(show, [seat async for seat in _seats_query(show)])
+
+
+def _seat_map(show, seats):
+    """
+    Compact seat map for a show.
+
+    The layout is sent once per row and availability as run lengths:
+    - rows: [row, [seat labels], [seat type indexes]] in seat order
+    - seat_types: the seat types the indexes refer to
+    - ids: ShowSeat ids (used for booking) as [first_id, count] runs
+    - booked: alternating run lengths of available/taken seats, starting with available.
+      Seats under an unexpired hold count as taken.
+    """
+    now = timezone.now()
+    seats = sorted(seats, key=lambda s: _seat_sort_key(s[1]))
+
+    seat_types = []
+    rows = []
+    for seat_id, seat_number, seat_type, is_booked, held_until in seats:
+        row, label = SEAT_NUMBER_RE.match(seat_number).groups()
+        if seat_type not in seat_types:
+            seat_types.append(seat_type)
+        if not rows or rows[-1][0] != row:
+            rows.append([row, [], []])
+        rows[-1][1].append(label)
+        rows[-1][2].append(seat_types.index(seat_type))
+
+    return {
+        "show": str(show.id),
+        "version": show.seat_version,
+        "seat_types": seat_types,
+        "rows": rows,
+        "ids": _id_runs([s[0] for s in seats]),
+        "booked": _runs([s[3] or (s[4] is not None and s[4] > now) for s in seats]),
+    }
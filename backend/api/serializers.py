@@ -1,10 +1,38 @@
 from rest_framework import serializers
 from .models import (
-    Movie, Show, Theater, Seat, ShowSeat,
-    Ticket, TicketSeat, Payment, Review, UserProfile
+    Movie, Show, Theater, Seat, ShowSeat, SeatHold,
+    Ticket, TicketSeat, Payment, Review, UserProfile, MAX_SEATS_PER_BOOKING
 )
 from django.contrib.auth.models import User
 
+from .metrics import serialization_timer
+
+
+class SparseFieldsMixin:
+    """
+    Lets GET requests pick the fields they need with ?fields=id,title,...
+    Unknown names are ignored. Writes always use every field so validation is unchanged.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None or request.method != "GET":
+            return
+
+        requested = request.query_params.get("fields")
+        if not requested:
+            return
+
+        keep = {name.strip() for name in requested.split(",")}
+        for name in set(self.fields) - keep:
+            self.fields.pop(name)
+
+    def to_representation(self, instance):
+        # timed for the request metrics, see api/metrics.py
+        with serialization_timer():
+            return super().to_representation(instance)
+
 
 # User Serializer
 class UserSerializer(serializers.ModelSerializer):
@@ -102,7 +130,7 @@ class UserSerializer(serializers.ModelSerializer):
         return rep
 
 
-class MovieSerializer(serializers.ModelSerializer):
+class MovieSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     description = serializers.CharField(source="synopsis")
 
     class Meta:
@@ -116,29 +144,40 @@ class MovieSerializer(serializers.ModelSerializer):
             "runtime_minutes",
             "release_date",
             "rating",
+            "review_count",
+            "average_rating",
             "poster_url",
             "trailer_url",
             "is_current",
             "created_at",
             "updated_at",
         ]
+        extra_kwargs = {
+            # maintained from the reviews
+            "review_count": {"read_only": True},
+            "average_rating": {"read_only": True},
+        }
 
 
-class SeatSerializer(serializers.ModelSerializer):
+class SeatSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Seat
         fields = ["id", "theater", "seat_number", "seat_type"]
 
 
-class TheaterSerializer(serializers.ModelSerializer):
+class TheaterSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     seats = SeatSerializer(many=True, read_only=True)
 
     class Meta:
         model = Theater
         fields = ["id", "name", "address", "total_seats", "seats"]
+        extra_kwargs = {
+            # kept in sync with the theater's seats
+            "total_seats": {"read_only": True},
+        }
 
 
-class ShowSeatSerializer(serializers.ModelSerializer):
+class ShowSeatSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     seat_number = serializers.CharField(source="seat.seat_number", read_only=True)
     seat_type = serializers.CharField(source="seat.seat_type", read_only=True)
 
@@ -147,7 +186,7 @@ class ShowSeatSerializer(serializers.ModelSerializer):
         fields = ["id", "show", "seat", "seat_number", "seat_type", "is_booked"]
 
 
-class ShowSerializer(serializers.ModelSerializer):
+class ShowSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     movie_title = serializers.ReadOnlyField(source="movie.title")
     theater_name = serializers.ReadOnlyField(source="theater.name")
     show_seats = ShowSeatSerializer(many=True, read_only=True)
@@ -169,6 +208,55 @@ class ShowSerializer(serializers.ModelSerializer):
         ]
 
 
+# Used for listing shows: seat counts are annotated on the queryset in SQL,
+# so no ShowSeat rows are loaded or serialized.
+class ShowSummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    movie_title = serializers.ReadOnlyField(source="movie.title")
+    theater_name = serializers.ReadOnlyField(source="theater.name")
+    available_seats = serializers.IntegerField(read_only=True)
+    booked_seats = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Show
+        fields = [
+            "id",
+            "movie",
+            "movie_title",
+            "theater",
+            "theater_name",
+            "showtime",
+            "price",
+            "is_active",
+            "created_at",
+            "updated_at",
+            "available_seats",
+            "booked_seats",
+        ]
+
+
+class SeatHoldSerializer(serializers.ModelSerializer):
+    # ShowSeat IDs to reserve, only used when creating the hold
+    seat_ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, max_length=MAX_SEATS_PER_BOOKING, write_only=True
+    )
+
+    class Meta:
+        model = SeatHold
+        fields = ["id", "show", "seat_ids", "expires_at"]
+        extra_kwargs = {
+            "expires_at": {"read_only": True},
+        }
+
+
+# Creates the same show at several showtimes, e.g. a week of schedules for one screen
+class ShowBatchSerializer(serializers.Serializer):
+    movie = serializers.PrimaryKeyRelatedField(queryset=Movie.objects.all())
+    theater = serializers.PrimaryKeyRelatedField(queryset=Theater.objects.all())
+    price = serializers.DecimalField(max_digits=6, decimal_places=2)
+    is_active = serializers.BooleanField(default=True)
+    showtimes = serializers.ListField(child=serializers.DateTimeField(), allow_empty=False, max_length=500)
+
+
 class TicketSeatSerializer(serializers.ModelSerializer):
     seat_number = serializers.CharField(source="seat.seat_number", read_only=True)
     seat_type = serializers.CharField(source="seat.seat_type", read_only=True)
@@ -178,7 +266,7 @@ class TicketSeatSerializer(serializers.ModelSerializer):
         fields = ["id", "seat_number", "seat_type"]
 
 
-class TicketSerializer(serializers.ModelSerializer):
+class TicketSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     movie_title = serializers.CharField(source="show.movie.title", read_only=True)
     theater_name = serializers.CharField(source="show.theater.name", read_only=True)
     show_time = serializers.DateTimeField(source="show.showtime", read_only=True)
@@ -188,6 +276,9 @@ class TicketSerializer(serializers.ModelSerializer):
     refund_amount = serializers.DecimalField(max_digits=8, decimal_places=2, read_only=True)
     cancelled_at = serializers.DateTimeField(read_only=True)
     cancellation_reason = serializers.CharField(read_only=True)
+    # filled in by the issue_ticket job after the booking commits, so it is still
+    # empty in the response to the booking itself
+    ticket_qr = serializers.CharField(read_only=True)
 
     class Meta:
         model = Ticket
@@ -231,7 +322,7 @@ class PaymentSerializer(serializers.ModelSerializer):
         ]
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     movie_title = serializers.ReadOnlyField(source="movie.title")
     username = serializers.ReadOnlyField(source="user.username")
     user = serializers.PrimaryKeyRelatedField(read_only=True)
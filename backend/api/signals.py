@@ -0,0 +1,59 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import bump_version
+from .models import Movie, Review, Show, Theater, UserProfile
+
+
+# Any change to a movie invalidates the cached catalog responses
+@receiver(post_save, sender=Movie)
+@receiver(post_delete, sender=Movie)
+def invalidate_movie_catalog(sender, **kwargs):
+    bump_version("movies")
+
+
+# The schedule lists movie and theater names and every show's time and price
+@receiver(post_save, sender=Movie)
+@receiver(post_delete, sender=Movie)
+@receiver(post_save, sender=Theater)
+@receiver(post_delete, sender=Theater)
+@receiver(post_save, sender=Show)
+@receiver(post_delete, sender=Show)
+def invalidate_schedule(sender, **kwargs):
+    bump_version("schedule")
+
+
+# /api/user/me/ is cached per user
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_me(sender, instance, **kwargs):
+    bump_version(f"user:{instance.user_id if sender is UserProfile else instance.pk}")
+
+
+# Movie.review_count / rating_sum / average_rating follow every review write: the API, the
+# admin, the shell and QuerySet.delete(). QuerySet.update() sends no signals, after one
+# run rebuild_movie_ratings.
+@receiver(pre_save, sender=Review)
+def remember_review_rating(sender, instance, raw=False, **kwargs):
+    instance._rating_before_save = None
+    if not raw and not instance._state.adding:
+        instance._rating_before_save = Review.objects.filter(pk=instance.pk).values_list("movie_id", "rating").first()
+
+
+@receiver(post_save, sender=Review)
+def count_saved_review(sender, instance, raw=False, **kwargs):
+    if raw:
+        return  # fixtures bring their movies' aggregates with them
+    old = instance._rating_before_save
+    if old == (instance.movie_id, instance.rating):
+        return
+    if old:
+        Movie.apply_review_change(old[0], -1, -old[1])
+    Movie.apply_review_change(instance.movie_id, 1, instance.rating)
+
+
+@receiver(post_delete, sender=Review)
+def count_deleted_review(sender, instance, **kwargs):
+    Movie.apply_review_change(instance.movie_id, -1, -instance.rating)
@@ -0,0 +1,118 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db.models import Count, DecimalField, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from .models import Movie, ShowSeat, Ticket, TicketSeat
+
+
+# how long computed dashboard stats are reused before they are recomputed
+ADMIN_STATS_CACHE_SECONDS = 30
+
+CENTS = Decimal("0.01")
+SOLD = ~Q(status="cancelled")  # paid and used tickets
+CANCELLED = Q(status="cancelled")
+
+
+def _money(expression):
+    return Coalesce(expression, Value(Decimal("0.00")), output_field=DecimalField(max_digits=12, decimal_places=2))
+
+
+# one row of sales numbers, computed in SQL over Ticket
+TICKET_AGGREGATES = {
+    "tickets_sold": Count("id", filter=SOLD),
+    "cancellations": Count("id", filter=CANCELLED),
+    "revenue": _money(Sum("total_price", filter=SOLD)),
+    "refunds": _money(Sum("refund_amount", filter=CANCELLED)),
+}
+
+# booked and total seats, computed in SQL over ShowSeat
+SEAT_AGGREGATES = {
+    "seats_total": Count("id"),
+    "seats_booked": Count("id", filter=Q(is_booked=True)),
+}
+
+
+def _sales_row(row):
+    return {
+        "tickets_sold": row["tickets_sold"],
+        "cancellations": row["cancellations"],
+        "revenue": str(Decimal(row["revenue"]).quantize(CENTS)),
+        "refunds": str(Decimal(row["refunds"]).quantize(CENTS)),
+    }
+
+
+def _occupancy(row):
+    total = row["seats_total"] if row else 0
+    booked = row["seats_booked"] if row else 0
+    return {
+        "seats_booked": booked,
+        "seats_total": total,
+        "occupancy": round(booked / total, 4) if total else 0,
+    }
+
+
+def _grouped(key, name):
+    """Sales and occupancy per movie or theater, keyed on the show's foreign key."""
+    fields = (f"show__{key}_id", f"show__{key}__{name}")
+    sales = {
+        row[fields[0]]: row
+        for row in Ticket.objects.values(*fields).annotate(**TICKET_AGGREGATES).order_by()
+    }
+    seats = {
+        row[fields[0]]: row
+        for row in ShowSeat.objects.values(*fields).annotate(**SEAT_AGGREGATES).order_by()
+    }
+
+    rows = []
+    for pk in sales.keys() | seats.keys():
+        sold = sales.get(pk, {"tickets_sold": 0, "cancellations": 0, "revenue": Decimal("0.00"), "refunds": Decimal("0.00")})
+        rows.append({
+            key: str(pk),
+            name: (sales.get(pk) or seats.get(pk))[fields[1]],
+            **_sales_row(sold),
+            **_occupancy(seats.get(pk)),
+        })
+    return sorted(rows, key=lambda r: Decimal(r["revenue"]), reverse=True)
+
+
+def compute_admin_stats(days=30):
+    """
+    Dashboard numbers for admins, all computed with SQL aggregates:
+    totals, sales and occupancy per movie and per theater, sales per booking day
+    and occupancy per show day for the last `days` days.
+    """
+    since = timezone.now() - timedelta(days=days)
+
+    totals = Ticket.objects.aggregate(**TICKET_AGGREGATES)
+    by_day = (
+        Ticket.objects.filter(booking_time__gte=since)
+        .annotate(day=TruncDate("booking_time"))
+        .values("day")
+        .annotate(**TICKET_AGGREGATES)
+        .order_by("day")
+    )
+    occupancy_by_day = (
+        ShowSeat.objects.filter(show__showtime__gte=since)
+        .annotate(day=TruncDate("show__showtime"))
+        .values("day")
+        .annotate(**SEAT_AGGREGATES)
+        .order_by("day")
+    )
+
+    return {
+        "totals": {
+            "movies": Movie.objects.count(),
+            "users": User.objects.count(),
+            "tickets": totals["tickets_sold"] + totals["cancellations"],
+            "seats_sold": TicketSeat.objects.exclude(ticket__status="cancelled").count(),
+            **_sales_row(totals),
+        },
+        "by_movie": _grouped("movie", "title"),
+        "by_theater": _grouped("theater", "name"),
+        "by_day": [{"day": row["day"].isoformat(), **_sales_row(row)} for row in by_day],
+        "occupancy_by_day": [{"day": row["day"].isoformat(), **_occupancy(row)} for row in occupancy_by_day],
+    }
@@ -0,0 +1,18 @@
+from .jobs import task
+from .models import Ticket
+
+
+@task
+def issue_ticket(ticket_id):
+    """
+    Post-booking work for a ticket, run by the job worker after the booking commits:
+    fills in the QR code data. Rendering (QR image, PDF, confirmation email) goes here too.
+    """
+    ticket = Ticket.objects.filter(pk=ticket_id).only("id", "user_id").first()
+    if ticket is None:
+        return  # booking was removed before the job ran
+
+    # only set once, so a retried job doesn't redo it
+    Ticket.objects.filter(pk=ticket.pk, ticket_qr="").update(
+        ticket_qr=f"MBS-TICKET-{ticket.id}-USER-{ticket.user_id}"
+    )
@@ -0,0 +1,47 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api.authentication import ClaimsTokenObtainPairSerializer
+from api.management.commands.check_query_budgets import Command as CheckQueryBudgets
+from api.metrics import query_budget
+
+
+class QueryBudgetTests(TestCase):
+    """The requests of manage.py check_query_budgets, so an N+1 query fails the test suite."""
+
+    def setUp(self):
+        cache.clear()
+        # name -> (budget, user, method, path)
+        self.checks = {name: check for name, *check in CheckQueryBudgets().checks()}
+
+    def assertWithinBudget(self, name):
+        budget, user, method, path = self.checks[name]
+        client = APIClient()
+        token = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        with query_budget(budget):
+            response = getattr(client, method)(path, format='json')
+        self.assertLess(response.status_code, 300, response.content)
+
+    def test_ticket_list(self):
+        for name in ('ticket list, 1 ticket', 'ticket list, 25 tickets', 'ticket list, staff', 'bookings list'):
+            with self.subTest(name):
+                self.assertWithinBudget(name)
+
+    def test_ticket_detail(self):
+        self.assertWithinBudget('ticket detail')
+
+    def test_ticket_update(self):
+        self.assertWithinBudget('ticket update')
+
+    def test_ticket_cancel(self):
+        self.assertWithinBudget('ticket cancel')
+
+    def test_ticket_destroy(self):
+        for name in ('ticket destroy', 'booking delete'):
+            with self.subTest(name):
+                self.assertWithinBudget(name)
+
+    def test_me(self):
+        self.assertWithinBudget('me')
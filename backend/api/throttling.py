@@ -0,0 +1,110 @@
+import threading
+from collections import OrderedDict
+from functools import cache
+
+from django.conf import settings
+from django.core.cache import cache as django_cache
+from django.utils.module_loading import import_string
+from rest_framework.throttling import SimpleRateThrottle
+
+
+def _take(tokens, updated, capacity, refill_per_second, now):
+    """(tokens left, seconds to wait) after taking one token from a bucket last seen at `updated`."""
+    tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+    if tokens >= 1:
+        return tokens - 1, 0
+    return tokens, (1 - tokens) / refill_per_second
+
+
+class LocalBucketStore:
+    """Token buckets in this process's memory, so each worker counts on its own."""
+
+    # the least recently used buckets are dropped past this many keys
+    MAX_BUCKETS = 10000
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets = OrderedDict()  # key -> (tokens, updated)
+
+    def take(self, key, capacity, refill_per_second, now):
+        """Take a token from the key's bucket: 0 if there was one, else the seconds until there is."""
+        with self.lock:
+            tokens, updated = self.buckets.pop(key, (capacity, now))
+            tokens, wait = _take(tokens, updated, capacity, refill_per_second, now)
+            self.buckets[key] = (tokens, now)
+            if len(self.buckets) > self.MAX_BUCKETS:
+                self.buckets.popitem(last=False)
+        return wait
+
+
+class CacheBucketStore:
+    """
+    Token buckets in the Django cache, shared by every worker when that is Redis. The read
+    and write aren't atomic, so concurrent requests for one key may get a token too many.
+    """
+
+    def take(self, key, capacity, refill_per_second, now):
+        tokens, updated = django_cache.get(key, (capacity, now))
+        tokens, wait = _take(tokens, updated, capacity, refill_per_second, now)
+        # an untouched bucket is full again after this long, so it can go
+        django_cache.set(key, (tokens, now), int(capacity / refill_per_second) + 1)
+        return wait
+
+
+@cache
+def get_bucket_store():
+    return import_string(settings.AUTH_THROTTLE_STORE)()
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    SimpleRateThrottle as a token bucket: a burst of up to the rate's number of requests,
+    then one more every period / number seconds. The rate is DEFAULT_THROTTLE_RATES[scope],
+    the buckets are kept in the AUTH_THROTTLE_STORE.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        refill_per_second = self.num_requests / self.duration
+        self.wait_seconds = get_bucket_store().take(self.key, self.num_requests, refill_per_second, self.timer())
+        return self.wait_seconds == 0
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class RegisterThrottle(TokenBucketThrottle):
+    """Sign-ups per IP."""
+    scope = "register"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": self.get_ident(request)}
+
+
+class LoginThrottle(RegisterThrottle):
+    """Logins per IP."""
+    scope = "login"
+
+
+class LoginUsernameThrottle(TokenBucketThrottle):
+    """Logins per username tried, whichever IPs they come from."""
+    scope = "login_username"
+
+    def get_cache_key(self, request, view):
+        username = request.data.get("username") if hasattr(request.data, "get") else None
+        if not username:
+            return None  # the serializer rejects it without checking a password
+        return self.cache_format % {"scope": self.scope, "ident": username}
+
+
+class ChangePasswordThrottle(TokenBucketThrottle):
+    """Password changes per user."""
+    scope = "change_password"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": request.user.id}
@@ -3,8 +3,9 @@ from rest_framework.routers import DefaultRouter
 
 from .views import (
     MovieViewSet, ShowViewSet, TheaterViewSet,
-    TicketViewSet, ReviewViewSet, SeatViewSet, ShowSeatViewSet,
-    CreateUserView, MeView, UpdateUserProfileView, ChangePasswordView
+    TicketViewSet, ReviewViewSet, SeatViewSet, ShowSeatViewSet, SeatHoldViewSet,
+    CreateUserView, MeView, UpdateUserProfileView, ChangePasswordView,
+    AdminStatsView, ScheduleView, MetricsView, show_seats_live
 )
 
 
@@ -15,6 +16,7 @@ router.register(r"theaters", TheaterViewSet, basename="theaters")
 router.register(r"seats", SeatViewSet, basename="seats")
 router.register(r"show-seats", ShowSeatViewSet, basename="show-seats")
 router.register(r"tickets", TicketViewSet, basename="tickets")
+router.register(r"holds", SeatHoldViewSet, basename="holds")
 router.register(r"reviews", ReviewViewSet, basename="reviews")
 
 booking_list = TicketViewSet.as_view({
@@ -35,6 +37,14 @@ urlpatterns = [
     path("user/update-profile/", UpdateUserProfileView.as_view(), name="update-profile"),
     path("user/change-password/", ChangePasswordView.as_view(), name="change-password"),
 
+    # Showtimes
+    path("schedule/", ScheduleView.as_view(), name="schedule"),
+    path("shows/<uuid:pk>/live/", show_seats_live, name="show-seats-live"),
+
+    # Admin
+    path("admin/stats/", AdminStatsView.as_view(), name="admin-stats"),
+    path("metrics/", MetricsView.as_view(), name="metrics"),
+
     # router routes
     path("", include(router.urls)),
 
@@ -1,38 +1,70 @@
 from django.contrib.auth.models import User
-from rest_framework import viewsets, generics, status
+from rest_framework import viewsets, generics, mixins, status
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from django.conf import settings
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.db import transaction
+from django.db.models import Prefetch, prefetch_related_objects
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, FilteredRelation, Q, Sum
 from django.utils import timezone
 from datetime import timedelta
+from decimal import Decimal
+import uuid
 
 from .permissions import IsAdmin, IsAdminOrReadOnly, IsOrderOwner
 from .serializers import (
     UserSerializer, MovieSerializer, ShowSerializer,
     TheaterSerializer, TicketSerializer, ReviewSerializer,
-    SeatSerializer, ShowSeatSerializer
+    SeatSerializer, ShowSeatSerializer, ShowSummarySerializer, SeatHoldSerializer,
+    ShowBatchSerializer
 )
 from .models import (
     Movie, Show, Theater, Ticket, Review,
-    Seat, ShowSeat, TicketSeat, Payment, CANCELLATION_POLICY, UserProfile
+    Seat, ShowSeat, SeatHold, TicketSeat, Payment, CANCELLATION_POLICY, UserProfile,
+    SEAT_HOLD_MINUTES, MAX_SEATS_PER_BOOKING, free_seat_q, refund_percentage
 )
+from .cache import bump_version, cached_response
+from .fast_serializers import FastReadMixin
+from .layouts import parse_layout_spec, parse_layout_csv
+from .jobs import enqueue
+from .live import RESYNC, get_broker, publish_seats, publish_show_cancelled, seats_channel
+from .metrics import registry
+from .pagination import RankedPagination
+from .search import search_movies
+from .schedule import build_schedule, schedule_range
+from .seatmap import build_seat_map, seat_map_etag, seat_map_shows
+from .stats import ADMIN_STATS_CACHE_SECONDS, compute_admin_stats
+from .tasks import issue_ticket
+from .throttling import ChangePasswordThrottle, RegisterThrottle
 
 
 class CreateUserView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [RegisterThrottle]
 
 
 class MeView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        serializer = UserSerializer(request.user)
-        return Response(serializer.data)
+        # request.user only has the token's claims, the user and profile are read in one
+        # query on a miss and cached until either changes (see api/signals.py)
+        def build():
+            user = User.objects.select_related("profile").filter(pk=request.user.id).first()
+            if user is None:
+                # deleted while the token is still valid
+                raise AuthenticationFailed("User not found", code="user_not_found")
+            return Response(UserSerializer(user).data)
+
+        return cached_response(request, f"user:{request.user.id}", build)
 
 
 class UpdateUserProfileView(APIView):
@@ -67,6 +99,7 @@ class UpdateUserProfileView(APIView):
 
 class ChangePasswordView(APIView):
     permission_classes = [IsAuthenticated]
+    throttle_classes = [ChangePasswordThrottle]
 
     def post(self, request):
         """Change user password"""
@@ -104,51 +137,440 @@ class ChangePasswordView(APIView):
 
 
 
-class MovieViewSet(viewsets.ModelViewSet):
+class AdminStatsView(APIView):
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        """Dashboard totals, per movie/theater and per day, cached for a short time"""
+        try:
+            days = min(max(int(request.query_params.get("days", 30)), 1), 366)
+        except ValueError:
+            raise ValidationError("days must be a number")
+
+        cache_key = f"admin-stats:{days}"
+        stats = cache.get(cache_key)
+        if stats is None:
+            stats = compute_admin_stats(days)
+            cache.set(cache_key, stats, ADMIN_STATS_CACHE_SECONDS)
+        return Response(stats)
+
+
+class MetricsView(APIView):
+    # scrapers send METRICS_TOKEN rather than a user's JWT
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        """Request metrics per view action of this process, in the Prometheus text format"""
+        if settings.METRICS_TOKEN:
+            if request.headers.get("Authorization") != f"Bearer {settings.METRICS_TOKEN}":
+                return Response(status=status.HTTP_403_FORBIDDEN)
+        elif not settings.DEBUG:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        return HttpResponse(registry.prometheus(), content_type="text/plain; version=0.0.4")
+
+
+class ScheduleView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        """
+        Movies -> theaters -> showtimes with remaining seats for a date range:
+        ?from=YYYY-MM-DD (default today) and ?to= (default a week on), optionally
+        narrowed with ?movie= and ?theater=.
+        """
+        first_day, last_day = schedule_range(request.query_params)
+        return Response(build_schedule(
+            first_day, last_day,
+            movie_id=request.query_params.get("movie"),
+            theater_id=request.query_params.get("theater"),
+        ))
+
+
+class MovieViewSet(FastReadMixin, viewsets.ModelViewSet):
     queryset = Movie.objects.all()
     serializer_class = MovieSerializer
     permission_classes = [IsAdminOrReadOnly]
 
+    # ?ordering= values the catalog can sort by, all backed by an index
+    ORDERINGS = ["-created_at", "-average_rating", "average_rating"]
+
+    @property
+    def cursor_ordering(self):
+        return self.catalog_ordering(self.request.query_params)
+
+    @classmethod
+    def catalog_ordering(cls, params):
+        ordering = params.get("ordering")
+        return ordering if ordering in cls.ORDERINGS else "-created_at"
+
+    # Catalog reads are served from the response cache, see api/cache.py
+    def list(self, request, *args, **kwargs):
+        return cached_response(request, "movies", lambda: super(MovieViewSet, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return cached_response(request, "movies", lambda: super(MovieViewSet, self).retrieve(request, *args, **kwargs))
+
+    @action(detail=False, methods=['get'], pagination_class=RankedPagination)
+    def search(self, request):
+        """
+        Search the catalog: GET /api/movies/search/?q=words, best match first,
+        paginated with ?page= and ?page_size=. Takes the same filters as the list.
+        """
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            raise ValidationError({"q": "A search text is required"})
+
+        def build():
+            page = self.paginate_queryset(search_movies(self.get_queryset(), text))
+            return self.get_paginated_response(self.fast_data(page, many=True))
+
+        return cached_response(request, "movies", build)
+
+    def get_queryset(self):
+        return self.catalog_queryset(self.request.query_params)
+
+    @staticmethod
+    def catalog_queryset(params):
+        queryset = Movie.objects.defer("search_vector")
+
+        # Filter by minimum average review rating if provided
+        min_rating = params.get("min_rating")
+        if min_rating:
+            try:
+                queryset = queryset.filter(average_rating__gte=float(min_rating))
+            except ValueError:
+                raise ValidationError("min_rating must be a number")
+        return queryset
+
 
 class TheaterViewSet(viewsets.ModelViewSet):
     queryset = Theater.objects.prefetch_related("seats").all()
     serializer_class = TheaterSerializer
     permission_classes = [IsAdminOrReadOnly]
+    cursor_ordering = "-created_at"
 
+    def get_queryset(self):
+        # pickers ask for ?fields=id,name,... and don't need every seat of every theater
+        fields = self.request.query_params.get("fields")
+        skip_seats = fields and "seats" not in {name.strip() for name in fields.split(",")}
+        if self.action == "layout" or skip_seats:
+            return Theater.objects.all()
+        return super().get_queryset()
+
+    @action(detail=True, methods=['post'])
+    def layout(self, request, pk=None):
+        """
+        Create the theater's seats from a layout spec (see parse_layout_spec) or
+        from CSV lines of seat_number,seat_type sent as "csv" or an uploaded "file".
+        Seats that already exist are kept, with "replace" the old seats are removed first.
+        """
+        theater = self.get_object()
+
+        upload = request.FILES.get("file")
+        if upload is not None:
+            try:
+                seats = parse_layout_csv(upload.read().decode("utf-8"))
+            except UnicodeDecodeError:
+                raise ValidationError("The layout file must be UTF-8 text.")
+        elif "csv" in request.data:
+            if not isinstance(request.data.get("csv"), str):
+                raise ValidationError("csv must be text of seat_number,seat_type lines.")
+            seats = parse_layout_csv(request.data.get("csv"))
+        else:
+            seats = parse_layout_spec(request.data)
 
-class ShowViewSet(viewsets.ModelViewSet):
-    queryset = Show.objects.select_related("movie", "theater").prefetch_related("show_seats__seat").all()
+        if not seats:
+            raise ValidationError("The layout has no seats.")
+        for seat_number, seat_type in seats:
+            if len(seat_number) > 10 or len(seat_type) > 20:
+                raise ValidationError(f"Seat {seat_number} has a seat number or type that is too long.")
+
+        with transaction.atomic():
+            if request.data.get("replace") in (True, "true"):
+                # removing seats would also remove them from shows and tickets
+                if theater.shows.exists():
+                    raise ValidationError("Seats of a theater that has shows cannot be replaced.")
+                theater.seats.all().delete()
+
+            Seat.objects.bulk_create(
+                [Seat(theater=theater, seat_number=number, seat_type=seat_type) for number, seat_type in seats],
+                batch_size=2000,
+                ignore_conflicts=True
+            )
+            Theater.update_total_seats(theater.id)
+
+        theater.refresh_from_db(fields=["total_seats"])
+        return Response({"total_seats": theater.total_seats}, status=status.HTTP_201_CREATED)
+
+
+class ShowViewSet(FastReadMixin, viewsets.ModelViewSet):
+    queryset = Show.objects.select_related("movie", "theater").all()
     serializer_class = ShowSerializer
     permission_classes = [IsAdminOrReadOnly]
+    cursor_ordering = "-showtime"  # newest shows first
+
+    def get_serializer_class(self):
+        # The list only carries seat counts, the full seat map is on the detail view
+        if self.action == "list":
+            return ShowSummarySerializer
+        return ShowSerializer
+
+    @staticmethod
+    def with_seat_counts(queryset):
+        # Count seats in SQL instead of loading every ShowSeat of every show
+        return queryset.annotate(
+            available_seats=Count("show_seats", filter=free_seat_q("show_seats__")),
+            booked_seats=Count("show_seats", filter=Q(show_seats__is_booked=True)),
+        )
 
     def get_queryset(self):
-        queryset = Show.objects.select_related("movie", "theater").prefetch_related("show_seats__seat").all()
-        
+        queryset = Show.objects.select_related("movie", "theater").all()
+
+        if self.action == "list":
+            queryset = self.with_seat_counts(queryset)
+        elif self.action == "seatmap":
+            # the seat map reads its seats itself
+            queryset = seat_map_shows()
+        elif self.action in ("retrieve", "update", "partial_update"):
+            queryset = queryset.prefetch_related("show_seats__seat")
+        elif self.action == "cancel_bookings":
+            queryset = Show.objects.select_for_update()
+        return self.filter_shows(queryset, self.request.query_params)
+
+    @staticmethod
+    def filter_shows(queryset, params):
         # Filter by movie if provided
-        movie_id = self.request.query_params.get('movie', None)
+        movie_id = params.get('movie', None)
         if movie_id:
             queryset = queryset.filter(movie__id=movie_id)
         
         # Filter by theater if provided
-        theater_id = self.request.query_params.get('theater', None)
+        theater_id = params.get('theater', None)
         if theater_id:
             queryset = queryset.filter(theater__id=theater_id)
         
         return queryset
 
+    @action(detail=True, methods=['get'])
+    def seatmap(self, request, pk=None):
+        """Compact seat layout and availability, cached by clients through an ETag"""
+        show = self.get_object()
+        etag = seat_map_etag(show)
+
+        if etag in request.headers.get("If-None-Match", ""):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        return Response(build_seat_map(show), headers={"ETag": etag})
+
+    @transaction.atomic
+    def perform_create(self, serializer):
+        show = serializer.save()
+        # Give the show all seats of its theater right away
+        ShowSeat.create_for_shows([show])
+        prefetch_related_objects([show], "show_seats__seat")
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Create a show at each of the given showtimes, with their seats, in one request"""
+        serializer = ShowBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        shows = [
+            Show(
+                movie=data["movie"],
+                theater=data["theater"],
+                price=data["price"],
+                is_active=data["is_active"],
+                showtime=showtime
+            )
+            for showtime in data["showtimes"]
+        ]
+        with transaction.atomic():
+            Show.objects.bulk_create(shows)
+            ShowSeat.create_for_shows(shows)
+
+        created = self.with_seat_counts(
+            Show.objects.select_related("movie", "theater").filter(id__in=[show.id for show in shows])
+        ).order_by("showtime")
+        return Response(ShowSummarySerializer(created, many=True).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['post'])
+    def generate_seats(self, request, pk=None):
+        """Add any theater seats the show is missing (for shows created before seats were automatic)"""
+        show = self.get_object()
+        before = show.show_seats.count()
+        ShowSeat.create_for_shows([show])
+        created = show.show_seats.count() - before
+        return Response({"created": created}, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=['post'])
+    def cancel_bookings(self, request, pk=None):
+        """
+        Cancel a show: deactivate it, cancel all its paid tickets and release every seat,
+        in one transaction with set-based UPDATEs. Refunds follow CANCELLATION_POLICY,
+        or are in full with "full_refund": true.
+        """
+        full_refund = str(request.data.get("full_refund", "")).lower() in ("true", "1")
+        reason = request.data.get("reason") or "Show cancelled"
+        now = timezone.now()
+
+        with transaction.atomic():
+            # the show row is locked, so cancels of the same show run one after the other
+            show = self.get_object()
+            hours_until_show = (show.showtime - now).total_seconds() / 3600
+            percentage = 100 if full_refund else refund_percentage(hours_until_show)
+
+            # Every seat is released (not just booked ones) so this waits for bookings
+            # that are claiming seats right now, their tickets are then cancelled below.
+            ShowSeat.objects.filter(show=show).update(is_booked=False, hold=None, held_until=None)
+            released = TicketSeat.objects.filter(ticket__show=show, ticket__status="paid").count()
+            SeatHold.objects.filter(show=show).delete()
+
+            cancelled = Ticket.objects.filter(show=show, status="paid").update(
+                status="cancelled",
+                cancelled_at=now,
+                cancellation_reason=reason,
+                refund_amount=ExpressionWrapper(
+                    F("total_price") * percentage / 100, output_field=DecimalField(max_digits=8, decimal_places=2)
+                ),
+            )
+            refunded = Ticket.objects.filter(show=show, status="cancelled", cancelled_at=now).aggregate(
+                total=Sum("refund_amount")
+            )["total"]
+
+            Show.objects.filter(pk=show.pk).update(is_active=False, seat_version=F("seat_version") + 1)
+            # update() sends no signals
+            bump_version("schedule")
+            publish_show_cancelled(show.pk)
+
+        return Response({
+            "tickets_cancelled": cancelled,
+            "seats_released": released,
+            "refund_percentage": percentage,
+            "refund_total": str(Decimal(refunded or 0).quantize(Decimal("0.01"))),
+        }, status=status.HTTP_200_OK)
 
 
-class TicketViewSet(viewsets.ModelViewSet):
-    queryset = Ticket.objects.select_related("user", "show").prefetch_related("ticket_seats__seat").all()
+# seconds between keep-alive comments on an idle live stream, so proxies keep it open
+LIVE_KEEPALIVE_SECONDS = 15
+
+
+async def show_seats_live(request, pk):
+    """
+    Server-sent events with the seat changes of a show, from the broker in api/live.py:
+    {"show", "taken": [ShowSeat ids], "freed": [...]} as seats are booked, held and released,
+    {"cancelled": true} when the show is cancelled and {"resync": true} when the seat map
+    should be reloaded. Every stream starts with a resync, so clients load the seat map then
+    and apply the changes to it.
+    Only served under ASGI, a WSGI worker would be tied up for as long as a stream is open.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({"error": "Live updates are only served under ASGI"}, status=501)
+    if not await Show.objects.filter(pk=pk).aexists():
+        raise Http404
+
+    async def events():
+        # subscribed by the stream itself, so however early the client goes away it is
+        # unsubscribed. The resync comes after, so no change after the seat map load is missed.
+        subscription = get_broker().subscribe(seats_channel(pk))
+        try:
+            yield "retry: 3000\n\n"
+            yield f"data: {RESYNC}\n\n"
+            async for message in subscription.messages(LIVE_KEEPALIVE_SECONDS):
+                yield f"data: {message}\n\n" if message else ": keepalive\n\n"
+        finally:
+            get_broker().unsubscribe(subscription)
+
+    response = StreamingHttpResponse(events(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # nginx would hold the events back
+    return response
+
+
+class TicketViewSet(FastReadMixin, viewsets.ModelViewSet):
+    queryset = Ticket.objects.all()
     serializer_class = TicketSerializer
     permission_classes = [IsAuthenticated]
+    cursor_ordering = "-booking_time"
 
     def get_queryset(self):
         user = self.request.user
-        queryset = Ticket.objects.select_related("user", "show").prefetch_related("ticket_seats__seat")
+        # Everything TicketSerializer reads, in two queries however many tickets there are:
+        # the tickets joined with show, movie and theater, then their seats joined with Seat
+        queryset = Ticket.objects.select_related("user", "show__movie", "show__theater").prefetch_related(
+            Prefetch("ticket_seats", queryset=TicketSeat.objects.select_related("seat"))
+        )
+        return self.owned(queryset)
+
+    def owned(self, queryset, user_field="user_id"):
+        """Staff see every ticket, anyone else only their own (filtered before the lookup)."""
+        user = self.request.user
         if user.is_staff:
             return queryset
-        return queryset.filter(user=user)
+        return queryset.filter(**{user_field: user.id})
+
+    def get_ticket_with_seats(self):
+        """
+        get_object for update, destroy and cancel_ticket: the ticket with its show, movie,
+        theater and seats in one query, a row per TicketSeat joined up to the ticket and
+        across to the ShowSeat it holds. The ShowSeat ids are set as ticket.show_seat_ids.
+        """
+        try:
+            ticket_id = uuid.UUID(str(self.kwargs["pk"]))
+        except ValueError:
+            raise Http404("No Ticket matches the given query.")
+
+        show_seat = FilteredRelation("seat__showseat", condition=Q(seat__showseat__show=F("ticket__show")))
+        rows = list(
+            self.owned(TicketSeat.objects.filter(ticket_id=ticket_id), "ticket__user_id")
+            .select_related("seat", "ticket__show__movie", "ticket__show__theater")
+            .annotate(show_seat=show_seat, show_seat_id=F("show_seat__id"))
+            .order_by("pk")
+        )
+        if rows:
+            ticket = rows[0].ticket
+            for row in rows:
+                row.ticket = ticket
+            # what prefetch_related("ticket_seats") would have set
+            ticket._prefetched_objects_cache = {"ticket_seats": rows}
+            ticket.show_seat_ids = [row.show_seat_id for row in rows]
+        else:
+            # no such ticket (404), or one without seats
+            ticket = self.get_object()
+            ticket.show_seat_ids = []
+
+        self.check_object_permissions(self.request, ticket)
+        return ticket
+
+    @staticmethod
+    def release_seats(ticket):
+        """Free the ShowSeats of a ticket from get_ticket_with_seats, call in the transaction."""
+        ShowSeat.objects.filter(id__in=ticket.show_seat_ids).update(is_booked=False)
+        Show.bump_seat_version(ticket.show_id)
+        publish_seats(ticket.show_id, freed=ticket.show_seat_ids)
+
+    def update(self, request, *args, **kwargs):
+        # UpdateModelMixin.update with the one query lookup. The seats can't change here,
+        # so the response keeps them instead of loading them again.
+        partial = kwargs.pop("partial", False)
+        serializer = self.get_serializer(self.get_ticket_with_seats(), data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+        return Response(serializer.data)
+
+    def destroy(self, request, *args, **kwargs):
+        self.perform_destroy(self.get_ticket_with_seats())
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        # A paid ticket still holds its seats, so they are freed with it. The conditional
+        # UPDATE locks the row and tells if it was still paid (a cancel has freed them otherwise).
+        if Ticket.objects.filter(pk=instance.pk, status="paid").update(status="cancelled"):
+            self.release_seats(instance)
+        instance.delete()
 
     @transaction.atomic
     def perform_create(self, serializer):
@@ -159,31 +581,71 @@ class TicketViewSet(viewsets.ModelViewSet):
         if not show or not showseat_ids:
             raise ValidationError("Show and seat_ids are required for ticket booking.")
 
-        # Fetch ShowSeats by their IDs (not Seat IDs)
-        show_seats = ShowSeat.objects.select_for_update().filter(
-            id__in=showseat_ids, 
-            show=show, 
-            is_booked=False
-        )
+        if len(showseat_ids) > MAX_SEATS_PER_BOOKING:
+            raise ValidationError(f"At most {MAX_SEATS_PER_BOOKING} seats can be booked at once.")
+
+        if len(set(showseat_ids)) != len(showseat_ids):
+            raise ValidationError("The same seat was selected more than once.")
+
+        if not show.is_active:
+            raise ValidationError("This show has been cancelled.")
+
+        # Optional token of a seat hold made before payment (see SeatHoldViewSet)
+        hold_token = self.request.data.get("hold_token")
+        if hold_token:
+            try:
+                hold_token = uuid.UUID(str(hold_token))
+            except ValueError:
+                raise ValidationError("Invalid hold token.")
+
+        # Claim the seats with one conditional UPDATE instead of locking them first.
+        # Only seats that are still free get updated, so if another booking took
+        # any of them the rowcount comes up short and the transaction rolls back.
+        show_seats = ShowSeat.objects.filter(id__in=showseat_ids, show=show)
+        if hold_token:
+            # Held seats can only be booked by the owner of the hold until it expires. The
+            # hold row is locked, so a second booking with the same token waits here and then
+            # finds it used up. The UPDATE stays on ShowSeat alone: conditions behind a join
+            # aren't rechecked by PostgreSQL after waiting on a row lock.
+            now = timezone.now()
+            hold_is_valid = SeatHold.objects.select_for_update().filter(
+                pk=hold_token, user_id=self.request.user.id, expires_at__gt=now
+            ).exists()
+            if not hold_is_valid:
+                raise ValidationError("This seat hold has expired or was already used.")
+            show_seats = show_seats.filter(is_booked=False, hold_id=hold_token, held_until__gt=now)
+        else:
+            show_seats = show_seats.filter(free_seat_q())
+        claimed = show_seats.update(is_booked=True, hold=None, held_until=None)
 
-        if show_seats.count() != len(showseat_ids):
+        if claimed != len(showseat_ids):
             raise ValidationError("Some selected seats are already booked or invalid. Please choose other seats.")
 
-        total_price = show.price * len(showseat_ids)
+        # the show may have been cancelled while the seats were claimed (see cancel_bookings)
+        if not Show.objects.filter(pk=show.pk, is_active=True).exists():
+            raise ValidationError("This show has been cancelled.")
 
-        # Create ticket
-        ticket = serializer.save(user=self.request.user, total_price=total_price)
+        seat_ids = ShowSeat.objects.filter(id__in=showseat_ids).values_list("seat_id", flat=True)
+        total_price = show.price * len(showseat_ids)
 
-        # Generate QR code data for ticket
-        qr_data = f"MBS-TICKET-{ticket.id}-USER-{self.request.user.id}"
-        ticket.ticket_qr = qr_data
-        ticket.save()
+        ticket = serializer.save(user_id=self.request.user.id, total_price=total_price)
 
-        # Mark seats as booked and create TicketSeat objects
         TicketSeat.objects.bulk_create([
-            TicketSeat(ticket=ticket, seat=ss.seat) for ss in show_seats
+            TicketSeat(ticket=ticket, seat_id=seat_id) for seat_id in seat_ids
         ])
-        show_seats.update(is_booked=True)
+
+        leftover = []
+        if hold_token:
+            # the hold is used up, release any of its seats that were not booked
+            leftover = list(ShowSeat.objects.filter(hold_id=hold_token).values_list("id", flat=True))
+            ShowSeat.objects.filter(hold_id=hold_token).update(hold=None, held_until=None)
+            SeatHold.objects.filter(pk=hold_token).delete()
+
+        Show.bump_seat_version(show.id)
+        publish_seats(show.id, taken=showseat_ids, freed=leftover)
+
+        # QR data and anything else after the booking is done by the job worker (run_jobs)
+        enqueue(issue_ticket, ticket_id=str(ticket.id))
 
     def get_permissions(self):
         if self.action in ["destroy", "update", "partial_update"]:
@@ -195,7 +657,7 @@ class TicketViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     def cancel_ticket(self, request, pk=None):
         """Cancel a ticket and process refund based on cancellation policy"""
-        ticket = self.get_object()
+        ticket = self.get_ticket_with_seats()
 
         # Check if ticket is already cancelled
         if ticket.status == 'cancelled':
@@ -233,44 +695,105 @@ class TicketViewSet(viewsets.ModelViewSet):
             )
 
         # Calculate refund based on policy
-        if hours_until_show >= 24:
-            refund_percentage = CANCELLATION_POLICY['hours_24_plus']
-        elif hours_until_show >= 6:
-            refund_percentage = CANCELLATION_POLICY['hours_6_24']
-        else:
-            refund_percentage = CANCELLATION_POLICY['hours_1_6']
+        percentage = refund_percentage(hours_until_show)
+        refund_amount = (ticket.total_price * percentage) / 100
+        reason = request.data.get('reason', 'User requested cancellation')
 
-        refund_amount = (ticket.total_price * refund_percentage) / 100
-
-        # Update ticket
         with transaction.atomic():
-            ticket.status = 'cancelled'
-            ticket.cancelled_at = now
-            ticket.refund_amount = refund_amount
-            ticket.cancellation_reason = request.data.get('reason', 'User requested cancellation')
-            ticket.save()
-
-            # Release booked seats
-            show_seats = ShowSeat.objects.filter(
-                show=ticket.show,
-                seat__in=ticket.ticket_seats.all().values_list('seat_id', flat=True)
+            # Cancel with one conditional UPDATE, which locks the ticket row. Only a paid
+            # ticket is updated, so of two concurrent cancels just one gets a row (and a refund).
+            cancelled = Ticket.objects.filter(pk=ticket.pk, status='paid').update(
+                status='cancelled',
+                cancelled_at=now,
+                refund_amount=refund_amount,
+                cancellation_reason=reason,
+                updated_at=now
             )
-            show_seats.update(is_booked=False)
+            if not cancelled:
+                return Response(
+                    {"error": "Ticket is already cancelled"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            self.release_seats(ticket)
+
+        ticket.status = 'cancelled'
+        ticket.cancelled_at = now
+        ticket.refund_amount = refund_amount
+        ticket.cancellation_reason = reason
+        ticket.updated_at = now
 
         serializer = self.get_serializer(ticket)
         return Response({
             "message": "Ticket cancelled successfully",
             "refund_amount": str(refund_amount),
-            "refund_percentage": refund_percentage,
+            "refund_percentage": percentage,
             "ticket": serializer.data
         }, status=status.HTTP_200_OK)
 
 
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class SeatHoldViewSet(mixins.CreateModelMixin,
+                      mixins.RetrieveModelMixin,
+                      mixins.DestroyModelMixin,
+                      viewsets.GenericViewSet):
+    """Reserve seats for a few minutes while the user pays, the hold id is the token for booking"""
+    serializer_class = SeatHoldSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        # expired holds are ignored here and cleaned up by release_expired_holds
+        return SeatHold.objects.filter(user_id=self.request.user.id, expires_at__gt=timezone.now())
+
+    @transaction.atomic
+    def perform_create(self, serializer):
+        show = serializer.validated_data["show"]
+        showseat_ids = serializer.validated_data.pop("seat_ids")
+
+        if not show.is_active:
+            raise ValidationError("This show has been cancelled.")
+
+        if len(set(showseat_ids)) != len(showseat_ids):
+            raise ValidationError("The same seat was selected more than once.")
+
+        # One active hold per user and show, so nobody can keep a show's seats held by
+        # renewing holds. The user row is locked so two requests can't both pass the check.
+        now = timezone.now()
+        User.objects.select_for_update().filter(pk=self.request.user.id).exists()
+        if SeatHold.objects.filter(user_id=self.request.user.id, show=show, expires_at__gt=now).exists():
+            raise ValidationError("You already hold seats for this show. Book or release them first.")
+
+        expires_at = now + timedelta(minutes=SEAT_HOLD_MINUTES)
+        hold = serializer.save(user_id=self.request.user.id, expires_at=expires_at)
+
+        # Same conditional UPDATE as booking: only free seats are taken
+        held = ShowSeat.objects.filter(
+            free_seat_q(),
+            id__in=showseat_ids,
+            show=show
+        ).update(hold=hold, held_until=expires_at)
+
+        if held != len(showseat_ids):
+            raise ValidationError("Some selected seats are already booked or held. Please choose other seats.")
+
+        Show.bump_seat_version(show.id)
+        publish_seats(show.id, taken=showseat_ids)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        released = list(ShowSeat.objects.filter(hold=instance).values_list("id", flat=True))
+        ShowSeat.objects.filter(hold=instance).update(hold=None, held_until=None)
+        instance.delete()
+        Show.bump_seat_version(instance.show_id)
+        publish_seats(instance.show_id, freed=released)
+
+
+
+class ReviewViewSet(FastReadMixin, viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
     permission_classes = [IsAuthenticated]
+    cursor_ordering = "-created_at"
 
     def get_queryset(self):
         queryset = Review.objects.select_related("movie", "user").all()
@@ -279,13 +802,25 @@ class ReviewViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(movie_id=movie_id)
         return queryset
 
+    # The movie's review aggregates are updated by signals (see api/signals.py), in the
+    # same transaction as the review
+    @transaction.atomic
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        serializer.save(user_id=self.request.user.id)
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
 
 
 class SeatViewSet(viewsets.ModelViewSet):
     serializer_class = SeatSerializer
     permission_classes = [IsAdminOrReadOnly]
+    cursor_ordering = "id"
 
     def get_queryset(self):
         queryset = Seat.objects.select_related("theater").all()
@@ -294,10 +829,27 @@ class SeatViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(theater_id=theater_id)
         return queryset
 
+    # keep Theater.total_seats in sync with its seats
+    def perform_create(self, serializer):
+        seat = serializer.save()
+        Theater.update_total_seats(seat.theater_id)
+
+    def perform_update(self, serializer):
+        old_theater_id = serializer.instance.theater_id
+        seat = serializer.save()
+        Theater.update_total_seats(old_theater_id)
+        if seat.theater_id != old_theater_id:
+            Theater.update_total_seats(seat.theater_id)
+
+    def perform_destroy(self, instance):
+        instance.delete()
+        Theater.update_total_seats(instance.theater_id)
 
-class ShowSeatViewSet(viewsets.ModelViewSet):
+
+class ShowSeatViewSet(FastReadMixin, viewsets.ModelViewSet):
     serializer_class = ShowSeatSerializer
     permission_classes = [IsAdminOrReadOnly]
+    cursor_ordering = "id"
 
     def get_queryset(self):
         queryset = ShowSeat.objects.select_related("show", "seat").all()
@@ -305,3 +857,18 @@ class ShowSeatViewSet(viewsets.ModelViewSet):
         if show_id:
             queryset = queryset.filter(show_id=show_id)
         return queryset
+
+    def perform_create(self, serializer):
+        show_seat = serializer.save()
+        Show.bump_seat_version(show_seat.show_id)
+
+    def perform_update(self, serializer):
+        old_show_id = serializer.instance.show_id
+        show_seat = serializer.save()
+        Show.bump_seat_version(old_show_id)
+        if show_seat.show_id != old_show_id:
+            Show.bump_seat_version(show_seat.show_id)
+
+    def perform_destroy(self, instance):
+        instance.delete()
+        Show.bump_seat_version(instance.show_id)
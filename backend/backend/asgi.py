@@ -1,9 +1,21 @@
-
-
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from django.core.handlers.asgi import ASGIHandler
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
-application = get_asgi_application()
+
+class AsyncReadsASGIHandler(ASGIHandler):
+    """Resolves requests with the async read endpoints in front of the regular URLs (backend/asgi_urls.py)."""
+
+    def create_request(self, scope, body_file):
+        request, error_response = super().create_request(scope, body_file)
+        if request is not None:
+            request.urlconf = 'backend.asgi_urls'
+        return request, error_response
+
+
+# same as django.core.asgi.get_asgi_application()
+django.setup(set_prefix=False)
+application = AsyncReadsASGIHandler()
@@ -0,0 +1,11 @@
+from django.urls import include, path
+
+from .urls import urlpatterns as wsgi_urlpatterns
+
+
+# Under ASGI the read-heavy endpoints are async views (api/async_views.py),
+# everything else is served as under WSGI
+urlpatterns = [
+    path("api/", include("api.async_urls")),
+    *wsgi_urlpatterns,
+]
@@ -16,17 +16,37 @@ ALLOWED_HOSTS = ["*"]
 # --- Django REST Framework & Authentication ---
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # request.user comes from the token's claims, the User row is loaded only when needed
+        "api.authentication.JWTClaimsAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    # Keyset pagination, next/previous pages are in the Link header
+    "DEFAULT_PAGINATION_CLASS": "api.pagination.KeysetCursorPagination",
+    # JSON rendering is timed for the request metrics (see api/metrics.py), and done
+    # by orjson when it is installed (see api/renderers.py)
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    # Token buckets of the sign-up, login and password change endpoints (see api/throttling.py):
+    # a burst of up to N requests, then one more every period / N
+    "DEFAULT_THROTTLE_RATES": {
+        "register": "10/hour",  # per IP
+        "login": "30/min",  # per IP
+        "login_username": "10/min",  # per username tried
+        "change_password": "5/hour",  # per user
+    },
 }
 
 # --- JWT Configuration ---
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
+    # add the username and is_staff claims read by api.authentication.JWTClaimsAuthentication
+    "TOKEN_OBTAIN_SERIALIZER": "api.authentication.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "api.authentication.ClaimsTokenRefreshSerializer",
 }
 
 # --- Installed Applications ---
@@ -37,12 +57,15 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     "api",
     "rest_framework",
     "corsheaders",
 ]
 
 MIDDLEWARE = [
+    # first, so its timings cover the whole request
+    'api.metrics.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     "corsheaders.middleware.CorsMiddleware",
@@ -51,6 +74,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # a full password hashing pool is a 429, not a 500 (see api/passwords.py)
+    'api.passwords.HashingPoolFullMiddleware',
 ]
 
 ROOT_URLCONF = 'backend.urls'
@@ -88,6 +113,59 @@ DATABASES = {
 }
 
 
+# --- Cache ---
+# Local memory by default (per process), set REDIS_URL to share the cache between
+# workers (needs the redis package)
+REDIS_URL = os.getenv("REDIS_URL")
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+if REDIS_URL:
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+    }
+
+# --- Live seat updates ---
+# Seat changes are pushed to /api/shows/<id>/live/ streams (served under ASGI). The local
+# broker only reaches streams of the same process, with REDIS_URL every worker gets them.
+LIVE_SEATS_BROKER = "api.live.RedisBroker" if REDIS_URL else "api.live.LocalBroker"
+
+# --- Background jobs ---
+# Set JOBS_WORKER=1 when `manage.py run_jobs` runs next to the web server, it then runs the
+# queued jobs (ticket QR data and other post-booking work). Without it each job runs on a
+# background thread of the web process once the request that queued it commits, and
+# failed jobs wait for a worker to retry them.
+JOBS_WORKER = os.getenv("JOBS_WORKER") == "1"
+
+# --- Auth throttling ---
+# The local store counts per process, with REDIS_URL the buckets are shared by every worker.
+AUTH_THROTTLE_STORE = "api.throttling.CacheBucketStore" if REDIS_URL else "api.throttling.LocalBucketStore"
+
+# --- Metrics ---
+# Bearer token for scraping /api/metrics/, without one the metrics are only served with DEBUG on
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+
+# --- Password Hashing ---
+# PBKDF2 runs on a pool of PASSWORD_HASHING_WORKERS threads (see api/passwords.py), so a
+# burst of sign-ups and logins can't take every CPU from bookings. Up to
+# PASSWORD_HASHING_QUEUE more hashes wait for a thread, past that callers wait up to
+# PASSWORD_HASHING_WAIT_SECONDS for a place and then get a 429 (HashingPoolFull). 0 workers
+# hash inline.
+PASSWORD_HASHERS = [
+    "api.passwords.PooledPBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+PASSWORD_HASHING_WORKERS = int(os.getenv("PASSWORD_HASHING_WORKERS", "2"))
+PASSWORD_HASHING_QUEUE = int(os.getenv("PASSWORD_HASHING_QUEUE", "32"))
+PASSWORD_HASHING_WAIT_SECONDS = 5
+
 # --- Password Validation ---
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -120,3 +198,4 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # --- CORS Settings ---
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
+CORS_EXPOSE_HEADERS = ["Link"]
@@ -1,12 +1,13 @@
 from django.contrib import admin
 from django.urls import path, include
+from api.throttling import LoginThrottle, LoginUsernameThrottle
 from api.views import CreateUserView
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/user/register/", CreateUserView.as_view(), name="register"),
-    path("api/token/", TokenObtainPairView.as_view(), name="get_token"),
+    path("api/token/", TokenObtainPairView.as_view(throttle_classes=[LoginThrottle, LoginUsernameThrottle]), name="get_token"),
     path("api/token/refresh/", TokenRefreshView.as_view(), name="refresh"),
     path("api-auth/", include("rest_framework.urls")),
     path("api/", include("api.urls")),
@@ -84,4 +84,26 @@ api.interceptors.response.use(
   }
 );
 
+// List endpoints are paginated with a cursor, the URL of the next page
+// is in the Link header as <url>; rel="next" (null on the last page)
+export function getNextPageUrl(response) {
+  const link = response.headers?.link;
+  const match = link && link.match(/<([^>]+)>;\s*rel="next"/);
+  return match ? match[1] : null;
+}
+
+// Every row of a list endpoint: asks for the largest pages and follows the
+// Link header until the last one
+export async function getAllPages(url, config = {}) {
+  let res = await api.get(url, { ...config, params: { page_size: 500, ...config.params } });
+  const rows = [...res.data];
+  let nextUrl = getNextPageUrl(res);
+  while (nextUrl) {
+    res = await api.get(nextUrl);
+    rows.push(...res.data);
+    nextUrl = getNextPageUrl(res);
+  }
+  return rows;
+}
+
 export default api;
@@ -58,7 +58,10 @@ function ProtectedRoute({ children, isAdmin = false }) {
         setIsAuthorized(true);
         
         // Check if admin route requires is_staff check
-        if (isAdmin) {
+        if (isAdmin && typeof decoded.is_staff === "boolean") {
+          // the access token carries is_staff, no need to ask the server
+          setIsAdminUser(decoded.is_staff);
+        } else if (isAdmin) {
           try {
             const userRes = await api.get("/api/user/me/");
             const staffStatus = userRes.data.is_staff || false;
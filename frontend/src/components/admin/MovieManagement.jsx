@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from "react";
-import api from "../../api";
+import api, { getAllPages } from "../../api";
 import "../../styles/Admin.css";
 
 function MovieManagement() {
@@ -27,8 +27,7 @@ function MovieManagement() {
   const fetchMovies = async () => {
     try {
       setLoading(true);
-      const res = await api.get("/api/movies/");
-      setMovies(res.data);
+      setMovies(await getAllPages("/api/movies/"));
     } catch (err) {
       console.error("Error fetching movies:", err);
     } finally {
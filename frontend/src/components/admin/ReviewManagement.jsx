@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from "react";
-import api from "../../api";
+import api, { getAllPages } from "../../api";
 import "../../styles/Admin.css";
 
 function ReviewManagement() {
@@ -16,8 +16,7 @@ function ReviewManagement() {
   const fetchMovies = async () => {
     try {
       setLoading(true);
-      const res = await api.get("/api/movies/");
-      setMovies(res.data);
+      setMovies(await getAllPages("/api/movies/"));
     } catch (err) {
       console.error("Error fetching movies:", err);
     } finally {
@@ -27,8 +26,7 @@ function ReviewManagement() {
 
   const fetchReviews = async (movieId) => {
     try {
-      const res = await api.get(`/api/reviews/?movie=${movieId}`);
-      setReviews(res.data);
+      setReviews(await getAllPages(`/api/reviews/?movie=${movieId}`));
     } catch (err) {
       console.error("Error fetching reviews:", err);
       alert("Error: " + (err.message || "Failed to fetch reviews"));
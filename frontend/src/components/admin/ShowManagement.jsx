@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from "react";
-import api from "../../api";
+import api, { getAllPages } from "../../api";
 import "../../styles/Admin.css";
 
 function ShowManagement() {
@@ -31,14 +31,14 @@ function ShowManagement() {
   const fetchData = async () => {
     try {
       setLoading(true);
-      const [showsRes, moviesRes, theatersRes] = await Promise.all([
-        api.get("/api/shows/"),
-        api.get("/api/movies/"),
-        api.get("/api/theaters/")
+      const [showRows, movieRows, theaterRows] = await Promise.all([
+        getAllPages("/api/shows/"),
+        getAllPages("/api/movies/"),
+        getAllPages("/api/theaters/")
       ]);
-      setShows(showsRes.data);
-      setMovies(moviesRes.data);
-      setTheaters(theatersRes.data);
+      setShows(showRows);
+      setMovies(movieRows);
+      setTheaters(theaterRows);
     } catch (err) {
       console.error("Error fetching data:", err);
     } finally {
@@ -48,8 +48,7 @@ function ShowManagement() {
 
   const fetchShowSeats = async (showId) => {
     try {
-      const res = await api.get(`/api/show-seats/?show=${showId}`);
-      setShowSeats(res.data);
+      setShowSeats(await getAllPages(`/api/show-seats/?show=${showId}`));
     } catch (err) {
       console.error("Error fetching show seats:", err);
     }
@@ -216,6 +215,20 @@ function ShowManagement() {
     }
   };
 
+  const handleCancelShow = async (id) => {
+    if (!window.confirm("Cancel this show? All its tickets will be cancelled and refunded.")) return;
+    const fullRefund = window.confirm("Refund every ticket in full? (Cancel applies the cancellation policy)");
+
+    try {
+      const res = await api.post(`/api/shows/${id}/cancel_bookings/`, { full_refund: fullRefund });
+      alert(`Show cancelled: ${res.data.tickets_cancelled} tickets cancelled, $${res.data.refund_total} refunded`);
+      fetchData();
+    } catch (err) {
+      console.error("Error cancelling show:", err);
+      alert("Error: " + (err.response?.data?.detail || err.message));
+    }
+  };
+
   const handleManageSeats = (show) => {
     setSelectedShowForSeats(show.id);
     const theater = theaters.find(t => t.id === show.theater);
@@ -387,6 +400,14 @@ function ShowManagement() {
                     >
                       Manage Seats
                     </button>
+                    {show.is_active && (
+                      <button
+                        className="btn-small btn-delete"
+                        onClick={() => handleCancelShow(show.id)}
+                      >
+                        Cancel Show
+                      </button>
+                    )}
                     <button
                       className="btn-small btn-delete"
                       onClick={() => handleDelete(show.id)}
@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from "react";
-import api from "../../api";
+import api, { getAllPages } from "../../api";
 import "../../styles/Admin.css";
 
 function TheaterManagement() {
@@ -11,13 +11,18 @@ function TheaterManagement() {
   const [seats, setSeats] = useState([]);
   const [formData, setFormData] = useState({
     name: "",
-    address: "",
-    total_seats: ""
+    address: ""
   });
   const [seatForm, setSeatForm] = useState({
     seat_number: "",
     seat_type: "regular"
   });
+  const [layoutForm, setLayoutForm] = useState({
+    rows: "",
+    columns: "",
+    vip: "",
+    gaps: ""
+  });
 
   useEffect(() => {
     fetchTheaters();
@@ -26,8 +31,7 @@ function TheaterManagement() {
   const fetchTheaters = async () => {
     try {
       setLoading(true);
-      const res = await api.get("/api/theaters/");
-      setTheaters(res.data);
+      setTheaters(await getAllPages("/api/theaters/"));
     } catch (err) {
       console.error("Error fetching theaters:", err);
     } finally {
@@ -65,9 +69,10 @@ function TheaterManagement() {
   const handleSubmit = async (e) => {
     e.preventDefault();
     try {
+      // total_seats is kept in sync with the seats by the backend
       const data = {
-        ...formData,
-        total_seats: parseInt(formData.total_seats)
+        name: formData.name,
+        address: formData.address
       };
 
       if (editingId) {
@@ -80,8 +85,7 @@ function TheaterManagement() {
 
       setFormData({
         name: "",
-        address: "",
-        total_seats: ""
+        address: ""
       });
       setShowForm(false);
       setEditingId(null);
@@ -121,6 +125,39 @@ function TheaterManagement() {
     }
   };
 
+  const handleLayoutInputChange = (e) => {
+    const { name, value } = e.target;
+    setLayoutForm({
+      ...layoutForm,
+      [name]: value
+    });
+  };
+
+  const splitSelectors = (value) =>
+    value.split(",").map((part) => part.trim()).filter(Boolean);
+
+  const handleImportLayout = async (e) => {
+    e.preventDefault();
+    if (!selectedTheaterForSeats) return;
+
+    try {
+      // e.g. rows "A-P", columns "1-24", VIP "H-J, K5-20", gaps "A1-2, P"
+      const res = await api.post(`/api/theaters/${selectedTheaterForSeats}/layout/`, {
+        rows: layoutForm.rows,
+        columns: layoutForm.columns,
+        seat_types: { VIP: splitSelectors(layoutForm.vip) },
+        gaps: splitSelectors(layoutForm.gaps)
+      });
+      alert(`Layout imported, theater now has ${res.data.total_seats} seats`);
+      setLayoutForm({ rows: "", columns: "", vip: "", gaps: "" });
+      fetchTheaters();
+      setSeats(await getAllPages(`/api/seats/?theater=${selectedTheaterForSeats}`));
+    } catch (err) {
+      console.error("Error importing layout:", err);
+      alert("Error: " + (err.response?.data?.detail || JSON.stringify(err.response?.data) || err.message));
+    }
+  };
+
   const handleDeleteSeat = async (seatId) => {
     if (!window.confirm("Are you sure you want to delete this seat?")) return;
 
@@ -179,8 +216,7 @@ function TheaterManagement() {
             setEditingId(null);
             setFormData({
               name: "",
-              address: "",
-              total_seats: ""
+              address: ""
             });
           }}
         >
@@ -214,17 +250,6 @@ function TheaterManagement() {
               />
             </div>
 
-            <div className="form-group">
-              <label>Total Seats *</label>
-              <input
-                type="number"
-                name="total_seats"
-                value={formData.total_seats}
-                onChange={handleInputChange}
-                required
-              />
-            </div>
-
             <button type="submit" className="btn-primary">
               {editingId ? "Update Theater" : "Create Theater"}
             </button>
@@ -323,6 +348,59 @@ function TheaterManagement() {
               </form>
             </div>
 
+            <div className="form-section">
+              <h4>Import Seat Layout</h4>
+              <form onSubmit={handleImportLayout} className="admin-form">
+                <div className="form-row">
+                  <div className="form-group">
+                    <label>Rows *</label>
+                    <input
+                      type="text"
+                      name="rows"
+                      value={layoutForm.rows}
+                      onChange={handleLayoutInputChange}
+                      placeholder="e.g., A-P"
+                      required
+                    />
+                  </div>
+                  <div className="form-group">
+                    <label>Seats per Row *</label>
+                    <input
+                      type="text"
+                      name="columns"
+                      value={layoutForm.columns}
+                      onChange={handleLayoutInputChange}
+                      placeholder="e.g., 1-24"
+                      required
+                    />
+                  </div>
+                </div>
+                <div className="form-row">
+                  <div className="form-group">
+                    <label>VIP Seats</label>
+                    <input
+                      type="text"
+                      name="vip"
+                      value={layoutForm.vip}
+                      onChange={handleLayoutInputChange}
+                      placeholder="e.g., H-J, K5-20"
+                    />
+                  </div>
+                  <div className="form-group">
+                    <label>Gaps</label>
+                    <input
+                      type="text"
+                      name="gaps"
+                      value={layoutForm.gaps}
+                      onChange={handleLayoutInputChange}
+                      placeholder="e.g., A1-2, P"
+                    />
+                  </div>
+                </div>
+                <button type="submit" className="btn-primary">Import Layout</button>
+              </form>
+            </div>
+
             <div style={{ marginTop: "20px" }}>
               <h4>Existing Seats ({seats.length})</h4>
               {seats.length === 0 ? (
@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from "react";
-import api from "../../api";
+import api, { getNextPageUrl } from "../../api";
 import "../../styles/Admin.css";
 
 function TicketManagement() {
@@ -7,6 +7,7 @@ function TicketManagement() {
   const [loading, setLoading] = useState(true);
   const [filter, setFilter] = useState("all");
   const [searchTerm, setSearchTerm] = useState("");
+  const [nextPageUrl, setNextPageUrl] = useState(null);
 
   useEffect(() => {
     fetchTickets();
@@ -15,8 +16,10 @@ function TicketManagement() {
   const fetchTickets = async () => {
     try {
       setLoading(true);
+      // the first page, "Load more" follows the Link header
       const res = await api.get("/api/tickets/");
       setTickets(res.data);
+      setNextPageUrl(getNextPageUrl(res));
     } catch (err) {
       console.error("Error fetching tickets:", err);
     } finally {
@@ -24,6 +27,16 @@ function TicketManagement() {
     }
   };
 
+  const fetchMoreTickets = async () => {
+    try {
+      const res = await api.get(nextPageUrl);
+      setTickets([...tickets, ...res.data]);
+      setNextPageUrl(getNextPageUrl(res));
+    } catch (err) {
+      console.error("Error fetching more tickets:", err);
+    }
+  };
+
   const getFilteredTickets = () => {
     return tickets.filter((ticket) => {
       const matchesStatus = filter === "all" || ticket.status === filter;
@@ -119,6 +132,13 @@ function TicketManagement() {
             </tbody>
           </table>
         )}
+        {nextPageUrl && (
+          <div style={{ marginTop: "20px", textAlign: "center" }}>
+            <button className="btn-secondary" onClick={fetchMoreTickets}>
+              Load More Tickets
+            </button>
+          </div>
+        )}
       </div>
 
       <div className="stats-section">
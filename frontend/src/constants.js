@@ -2,3 +2,7 @@ export const API_BASE_URL = "http://127.0.0.1:8000";
 export const ACCESS_TOKEN_KEY = "access_token";
 export const REFRESH_TOKEN_KEY = "refresh_token";
 export const USERNAME_KEY = "username";
+// the user's current seat hold, released before a new one is made
+export const SEAT_HOLD_KEY = "seat_hold";
+// same limit as the backend's MAX_SEATS_PER_BOOKING
+export const MAX_SEATS_PER_BOOKING = 10;
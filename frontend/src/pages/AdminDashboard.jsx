@@ -26,21 +26,15 @@ function AdminDashboard() {
   const fetchStats = async () => {
     try {
       setLoading(true);
-      // Fetch basic stats
-      const [moviesRes, ticketsRes] = await Promise.all([
-        api.get("/api/movies/"),
-        api.get("/api/tickets/")
-      ]);
-
-      const totalRevenue = ticketsRes.data
-        .filter(t => t.status === 'paid')
-        .reduce((sum, t) => sum + parseFloat(t.total_price), 0);
+      // Totals are aggregated on the server
+      const res = await api.get("/api/admin/stats/");
+      const totals = res.data.totals;
 
       setStats({
-        total_movies: moviesRes.data.length,
-        total_bookings: ticketsRes.data.length,
-        total_revenue: totalRevenue.toFixed(2),
-        total_users: 0 // Would need a separate endpoint
+        total_movies: totals.movies,
+        total_bookings: totals.tickets,
+        total_revenue: totals.revenue,
+        total_users: totals.users
       });
     } catch (err) {
       console.error("Error fetching stats:", err);
@@ -1,8 +1,32 @@
 import { useState, useEffect } from "react";
 import { useParams, useNavigate } from "react-router-dom";
 import api from "../api";
+import { API_BASE_URL, MAX_SEATS_PER_BOOKING, SEAT_HOLD_KEY } from "../constants";
 import "../styles/Booking.css";
 
+// Expand the compact seat map from /api/shows/<id>/seatmap/ into one
+// object per seat: { id, seat_number, seat_type, is_booked }
+function decodeSeatMap(seatMap) {
+    const seats = [];
+    seatMap.rows.forEach(([row, labels, types]) => {
+        labels.forEach((label, i) => {
+            seats.push({ seat_number: row + label, seat_type: seatMap.seat_types[types[i]] });
+        });
+    });
+
+    let index = 0;
+    seatMap.ids.forEach(([firstId, count]) => {
+        for (let i = 0; i < count; i++) seats[index++].id = firstId + i;
+    });
+
+    // booked runs alternate available/booked, starting with available
+    index = 0;
+    seatMap.booked.forEach((length, run) => {
+        for (let i = 0; i < length; i++) seats[index++].is_booked = run % 2 === 1;
+    });
+    return seats;
+}
+
 function Booking() {
     const { movieId } = useParams();
     const navigate = useNavigate();
@@ -11,16 +35,25 @@ function Booking() {
     const [selectedTheater, setSelectedTheater] = useState("");
     const [shows, setShows] = useState([]);
     const [selectedShow, setSelectedShow] = useState("");
+    const [showDetail, setShowDetail] = useState(null);
     const [availableSeats, setAvailableSeats] = useState([]);
     const [selectedSeats, setSelectedSeats] = useState([]);
     const [loading, setLoading] = useState(true);
     const [pricePerTicket, setPricePerTicket] = useState(0);
 
     useEffect(() => {
-        // Fetch movie details
-        api.get(`/api/movies/${movieId}/`)
-            .then((res) => {
-                setMovie(res.data);
+        // Fetch the movie and its upcoming shows by theater in parallel
+        Promise.all([
+            api.get(`/api/movies/${movieId}/`),
+            api.get("/api/schedule/", { params: { movie: movieId } }),
+        ])
+            .then(([movieRes, scheduleRes]) => {
+                setMovie(movieRes.data);
+                const theaterList = scheduleRes.data.movies[0]?.theaters || [];
+                setTheaters(theaterList);
+                if (theaterList.length > 0) {
+                    setSelectedTheater(theaterList[0].id);
+                }
             })
             .catch((err) => {
                 alert("Error loading movie: " + err);
@@ -30,53 +63,90 @@ function Booking() {
     }, [movieId, navigate]);
 
     useEffect(() => {
-        // Fetch all theaters
-        if (movie) {
-            api.get("/api/theaters/")
-                .then((res) => {
-                    setTheaters(res.data);
-                    if (res.data.length > 0) {
-                        setSelectedTheater(res.data[0].id);
-                    }
-                })
-                .catch((err) => console.error("Error loading theaters:", err));
-        }
-    }, [movie]);
+        // Shows of the selected theater come with the schedule
+        const theater = theaters.find(t => t.id === selectedTheater);
+        setShows(theater ? theater.shows : []);
+        setSelectedShow("");
+        setAvailableSeats([]);
+        setSelectedSeats([]);
+    }, [theaters, selectedTheater]);
 
     useEffect(() => {
-        // Fetch shows for the selected movie and theater
-        if (movie && selectedTheater) {
-            api.get("/api/shows/", {
-                params: {
-                    movie: movieId,
-                    theater: selectedTheater,
-                },
-            })
+        // When a show is selected, load its seat map (the show list only carries
+        // seat counts) and keep it current with the seat changes the server pushes
+        if (!selectedShow) return;
+        const show = shows.find(s => s.id === selectedShow);
+        let seats = null;
+        let pending = []; // changes that arrive while the seat map loads
+        let closed = false;
+
+        const render = () => {
+            const available = seats.filter(ss => !ss.is_booked);
+            setShowDetail({ ...show, show_seats: seats });
+            setAvailableSeats(available);
+            // a seat someone else just took can't stay selected
+            setSelectedSeats(prev => prev.filter(id => available.some(ss => ss.id === id)));
+        };
+
+        const applyChange = (change) => {
+            const taken = new Set(change.taken);
+            const freed = new Set(change.freed);
+            seats = seats.map(ss =>
+                taken.has(ss.id) ? { ...ss, is_booked: true }
+                    : freed.has(ss.id) ? { ...ss, is_booked: false }
+                    : ss
+            );
+        };
+
+        const loadSeatMap = () => {
+            seats = null;
+            api.get(`/api/shows/${selectedShow}/seatmap/`)
                 .then((res) => {
-                    setShows(res.data);
-                    setSelectedShow("");
-                    setAvailableSeats([]);
-                    setSelectedSeats([]);
+                    if (closed) return;
+                    seats = decodeSeatMap(res.data);
+                    pending.forEach(applyChange);
+                    pending = [];
+                    setPricePerTicket(parseFloat(show.price));
+                    render();
                 })
-                .catch((err) => console.error("Error loading shows:", err));
-        }
-    }, [movie, selectedTheater, movieId]);
+                .catch((err) => console.error("Error loading seats:", err));
+        };
 
-    useEffect(() => {
-        // When a show is selected, load its available seats
-        if (selectedShow) {
-            const show = shows.find(s => s.id === selectedShow);
-            if (show) {
-                // Filter for available seats (is_booked = false)
-                const available = show.show_seats.filter(ss => !ss.is_booked);
-                setAvailableSeats(available);
-                setPricePerTicket(parseFloat(show.price));
-                setSelectedSeats([]);
+        const source = new EventSource(`${API_BASE_URL}/api/shows/${selectedShow}/live/`);
+        // every (re)connect starts with a resync, which loads the seat map; changes
+        // from then on are pushed
+        source.onmessage = (e) => {
+            const change = JSON.parse(e.data);
+            if (change.cancelled) {
+                source.close();
+                alert("This show has been cancelled.");
+                setSelectedShow("");
+            } else if (change.resync) {
+                loadSeatMap();
+            } else if (seats === null) {
+                pending.push(change);
+            } else {
+                applyChange(change);
+                render();
             }
-        }
+        };
+        source.onerror = () => {
+            // live updates aren't served (e.g. by the WSGI dev server), load the seat map once
+            if (source.readyState === EventSource.CLOSED && seats === null) loadSeatMap();
+        };
+
+        setSelectedSeats([]);
+        return () => {
+            closed = true;
+            source.close();
+        };
     }, [selectedShow, shows]);
 
     const toggleSeatSelection = (seatId) => {
+        if (!selectedSeats.includes(seatId) && selectedSeats.length >= MAX_SEATS_PER_BOOKING) {
+            alert(`You can book at most ${MAX_SEATS_PER_BOOKING} seats at once`);
+            return;
+        }
         setSelectedSeats((prev) =>
             prev.includes(seatId)
                 ? prev.filter(id => id !== seatId)
@@ -90,7 +160,7 @@ function Booking() {
     const totalPrice = pricePerTicket * selectedSeats.length;
     const quantity = selectedSeats.length;
 
-    const handleProceed = () => {
+    const handleProceed = async () => {
         if (!selectedShow) {
             alert("Please select a show");
             return;
@@ -100,11 +170,34 @@ function Booking() {
             return;
         }
         
-        const selectedShowData = shows.find(s => s.id === selectedShow);
+        // Hold the seats while the user pays so nobody else can book them. A user has one
+        // hold per show, so the one from an earlier visit to this page is released first.
+        const previousHold = sessionStorage.getItem(SEAT_HOLD_KEY);
+        if (previousHold) {
+            await api.delete(`/api/holds/${previousHold}/`).catch(() => {});  // gone once booked or expired
+            sessionStorage.removeItem(SEAT_HOLD_KEY);
+        }
+
+        let hold;
+        try {
+            const res = await api.post("/api/holds/", {
+                show: selectedShow,
+                seat_ids: selectedSeats
+            });
+            hold = res.data;
+            sessionStorage.setItem(SEAT_HOLD_KEY, hold.id);
+        } catch (err) {
+            const errors = err.response?.data;
+            alert(Array.isArray(errors) ? errors[0] : "Some selected seats were just taken. Please choose other seats.");
+            return;
+        }
+
         navigate("/payment", { 
             state: { 
                 movie, 
-                show: selectedShowData,
+                show: showDetail,
+                holdToken: hold.id,
+                holdExpiresAt: hold.expires_at,
                 selectedSeats, 
                 quantity, 
                 totalPrice 
@@ -158,7 +251,7 @@ function Booking() {
                                             day: 'numeric', 
                                             hour: '2-digit', 
                                             minute: '2-digit'
-                                        })} - ${show.price}
+                                        })} - ${show.price} ({show.available_seats} seats left)
                                     </option>
                                 ))}
                             </select>
@@ -1,6 +1,6 @@
 import { useEffect, useState } from "react";
 import { Link, useNavigate } from "react-router-dom";
-import api from "../api";
+import api, { getAllPages } from "../api";
 import DetailsModal from "../components/DetailsModal";
 import FilterButtons from "../components/FilterButtons";
 import MovieList from "../components/MovieList";
@@ -12,6 +12,7 @@ const Catalog = () => {
   const [movies, setMovies] = useState([]);
   const [filter, setFilter] = useState("all");
   const [search, setSearch] = useState("");
+  const [results, setResults] = useState(null);
 
   const [modalOpen, setModalOpen] = useState(false);
   const [selectedMovie, setSelectedMovie] = useState(null);
@@ -24,12 +25,12 @@ const Catalog = () => {
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const [moviesRes, userRes] = await Promise.all([
-          api.get("/api/movies/"),
+        const [movieRows, userRes] = await Promise.all([
+          getAllPages("/api/movies/"),
           api.get("/api/user/me/"),
         ]);
 
-        setMovies(moviesRes.data || []);
+        setMovies(movieRows);
         setIsAdmin(Boolean(userRes.data?.is_staff));
       } catch (err) {
         console.error("Error loading catalog data:", err);
@@ -39,6 +40,29 @@ const Catalog = () => {
     fetchData();
   }, []);
 
+  // search runs on the server, a moment after the user stops typing
+  useEffect(() => {
+    const text = search.trim();
+    if (!text) {
+      setResults(null);
+      return;
+    }
+
+    let cancelled = false;
+    const timer = setTimeout(() => {
+      api.get("/api/movies/search/", { params: { q: text } })
+        .then((res) => {
+          if (!cancelled) setResults(res.data || []);
+        })
+        .catch((err) => console.error("Error searching movies:", err));
+    }, 250);
+
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [search]);
+
   const handleLogout = () => {
     localStorage.removeItem(ACCESS_TOKEN_KEY);
     localStorage.removeItem(REFRESH_TOKEN_KEY);
@@ -57,17 +81,12 @@ const Catalog = () => {
     setSelectedMovie(null);
   };
 
-  const filteredMovies = movies.filter((movie) => {
-    const matchFilter =
+  const filteredMovies = (results ?? movies).filter((movie) => {
+    return (
       filter === "all" ||
       (filter === "new" && movie.is_current) ||
-      (filter === "upcoming" && !movie.is_current);
-
-    const matchSearch = movie.title
-      .toLowerCase()
-      .includes(search.toLowerCase());
-
-    return matchFilter && matchSearch;
+      (filter === "upcoming" && !movie.is_current)
+    );
   });
 
   return (
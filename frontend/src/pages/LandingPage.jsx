@@ -3,13 +3,14 @@ import { Link, useNavigate } from 'react-router-dom';
 import '../styles/LandingPage.css';
 import heroImage from '../assets/hero-movies.jpg';
 import { ACCESS_TOKEN_KEY } from "../constants";
-import api from '../api';
+import api, { getAllPages } from '../api';
 import SearchBar from "../components/SearchBar";
 
 function LandingPage() {
   const navigate = useNavigate();
   const [movies, setMovies] = useState([]);
   const [searchQuery, setSearchQuery] = useState("");
+  const [results, setResults] = useState(null);
 
   useEffect(() => {
     // redirect logged-in users to catalog
@@ -18,11 +19,34 @@ function LandingPage() {
     }
 
     // fetch movies
-    api.get('/api/movies/')
-      .then(res => setMovies(res.data))
+    getAllPages('/api/movies/')
+      .then(rows => setMovies(rows))
       .catch(err => console.error('Error fetching movies:', err));
   }, [navigate]);
 
+  // search runs on the server, a moment after the user stops typing
+  useEffect(() => {
+    const text = searchQuery.trim();
+    if (!text) {
+      setResults(null);
+      return;
+    }
+
+    let cancelled = false;
+    const timer = setTimeout(() => {
+      api.get('/api/movies/search/', { params: { q: text } })
+        .then((res) => {
+          if (!cancelled) setResults(res.data || []);
+        })
+        .catch((err) => console.error('Error searching movies:', err));
+    }, 250);
+
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [searchQuery]);
+
   return (
     <div className="landing-page">
 
@@ -76,9 +100,7 @@ function LandingPage() {
         </div>
 
         <div className="movies-grid">
-          {movies
-            .filter(m => m.title.toLowerCase().includes(searchQuery.toLowerCase()))
-            .map(movie => (
+          {(results ?? movies).map(movie => (
               <div key={movie.id} className="movie-card">
                 <img src={movie.poster_url} alt={movie.title} className="movie-poster" />
 
@@ -91,8 +113,7 @@ function LandingPage() {
             ))}
         </div>
 
-        {movies.filter(m => m.title.toLowerCase().includes(searchQuery.toLowerCase())).length === 0 &&
-          searchQuery && (
+        {results && results.length === 0 && (
             <p className="no-results">
               No movies found for "{searchQuery}". Try another search.
             </p>
@@ -2,7 +2,7 @@
 import React, { useEffect, useState, useRef } from "react";
 import { useNavigate } from "react-router-dom";
 import html2pdf from "html2pdf.js";
-import api from "../api";
+import api, { getAllPages } from "../api";
 import "../styles/Form.css";
 import "../styles/Modals.css";
 
@@ -44,8 +44,7 @@ function MyOrders() {
       setCurrentUser(userRes.data);
       
       // Get tickets for current user only
-      const ticketsRes = await api.get("/api/tickets/");
-      setTickets(ticketsRes.data);
+      setTickets(await getAllPages("/api/tickets/"));
     } catch (err) {
       console.error("Error loading data:", err);
       if (err.response?.status === 401) navigate("/login");
@@ -69,8 +68,7 @@ function MyOrders() {
       setCurrentUser(userRes.data);
       
       // Get tickets for current user only
-      const ticketsRes = await api.get("/api/tickets/");
-      setTickets(ticketsRes.data);
+      setTickets(await getAllPages("/api/tickets/"));
     } catch (err) {
       console.error("Error loading tickets:", err);
       if (err.response?.status === 401) navigate("/login");
@@ -507,12 +505,13 @@ function MyOrders() {
                     </tbody>
                   </table>
 
-                  {/* QR Code */}
+                  {/* QR Code, ticket_qr stays empty until the booking's background job has run */}
                   <div style={{ textAlign: "center", marginTop: "15px", paddingTop: "15px", borderTop: "1px solid #eee" }}>
                     <p style={{ fontSize: "0.85rem", color: "#000", margin: "0 0 10px 0", fontWeight: "500" }}>Scan to verify</p>
                     <img
                       src={`https://api.qrserver.com/v1/create-qr-code/?size=120x120&data=${encodeURIComponent(
-                        viewTicketModal.ticketData.ticket_qr || `MBS-TICKET-${viewTicketModal.ticketData.id}`
+                        viewTicketModal.ticketData.ticket_qr ||
+                          `MBS-TICKET-${viewTicketModal.ticketData.id}-USER-${viewTicketModal.ticketData.user}`
                       )}`}
                       alt="QR Code"
                       style={{ width: "120px", height: "120px" }}
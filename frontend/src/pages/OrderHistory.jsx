@@ -1,6 +1,6 @@
 import { useState, useEffect } from "react";
 import { useNavigate } from "react-router-dom";
-import api from "../api";
+import { getAllPages } from "../api";
 import "../styles/OrderHistory.css";
 
 function OrderHistory() {
@@ -12,9 +12,9 @@ function OrderHistory() {
     }, []);
 
     const getOrders = () => {
-        api.get("/api/tickets/")
-            .then((res) => {
-                setOrders(res.data);
+        getAllPages("/api/tickets/")
+            .then((rows) => {
+                setOrders(rows);
             })
             .catch((err) => alert("Error fetching orders: " + err));
     };
@@ -28,7 +28,7 @@ function Payment() {
 
     if (!bookingData) return null;
 
-    const { movie, show, selectedSeats, quantity, totalPrice } = bookingData;
+    const { movie, show, selectedSeats, quantity, totalPrice, holdToken } = bookingData;
 
     const validateForm = () => {
         let newErrors = {};
@@ -91,7 +91,8 @@ function Payment() {
             const res = await api.post("/api/tickets/", {
                 show: show.id,
                 total_price: totalPrice,
-                seat_ids: selectedSeats  // Array of ShowSeat IDs
+                seat_ids: selectedSeats,  // Array of ShowSeat IDs
+                hold_token: holdToken     // Seats held on the booking page
             });
 
             if (res.status === 201) {
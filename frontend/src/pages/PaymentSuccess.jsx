@@ -11,7 +11,9 @@ function PaymentSuccess() {
 
     if (!booking) return <div className="error-msg">No booking details found. Please book a ticket first.</div>;
 
-    const ticketData = `MBS-TICKET-${booking.id}-USER-${booking.user}`;
+    // ticket_qr is filled in by a background job after the booking, so the booking
+    // response has it empty: build the same data from the ticket until then
+    const ticketData = booking.ticket_qr || `MBS-TICKET-${booking.id}-USER-${booking.user}`;
     const qrUrl = `https://api.qrserver.com/v1/create-qr-code/?size=100x100&data=${encodeURIComponent(ticketData)}`;
 
     const handlePrint = () => {
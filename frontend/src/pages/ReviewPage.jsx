@@ -2,7 +2,7 @@ import React, { useState, useEffect } from "react";
 import ReviewForm from "../components/ReviewForm";
 import ReviewList from "../components/ReviewList";
 import { useParams } from "react-router-dom";
-import api from "../api";
+import api, { getAllPages } from "../api";
 import "../styles/Reviews.css";
 
 export default function ReviewPage() {
@@ -13,8 +13,8 @@ export default function ReviewPage() {
 
     // Fetch movie and reviews
     const fetchReviews = () => {
-        api.get(`/api/reviews/?movie=${movieId}`)
-            .then(res => setPreviousReviews(res.data))
+        getAllPages(`/api/reviews/?movie=${movieId}`)
+            .then(rows => setPreviousReviews(rows))
             .catch(() => setPreviousReviews([]));
     };
 
@@ -1,7 +1,7 @@
 import {useEffect, useState } from "react";
 import TicketDetailsModal from "../components/TicketDetailsModal"
 import "../styles/UserOrders.css"
-import api from "../api"
+import { getAllPages } from "../api"
 
 export default function UserOrders() {
     const [orders, setOrders] = useState([]);
@@ -9,8 +9,8 @@ export default function UserOrders() {
     const [isModalOpen, setIsModalOpen] = useState(false);
 
     useEffect(() => {
-        api.get("/api/tickets/")
-            .then(res => setOrders(res.data))
+        getAllPages("/api/tickets/")
+            .then(rows => setOrders(rows))
             .catch(err => console.error(err));
     }, []);
 